@@ -0,0 +1,111 @@
+"""Vectorized creator match scoring.
+
+Only depends on NumPy so match pool worker processes can import it without
+loading the API server. Workers attach to creator columns that the server
+publishes in shared memory, so no creator documents are pickled per request.
+"""
+from multiprocessing import shared_memory
+import numpy as np
+
+# Row-aligned creator columns read by top_matches, in shared memory layout order
+SHARED_COLUMNS = ["active", "followers", "verified", "category_codes", "location_codes", "package_codes"]
+
+def filter_rows(columns, tables, query, rows):
+    """Mask of `rows` passing the match filters, and their total followers.
+
+    `rows` is an index array or slice(None) for every row.
+    """
+    category_codes = columns["category_codes"][rows]
+    location_codes = columns["location_codes"][rows]
+    totals = columns["followers"][rows][:, query["platform_mask"]].sum(axis=1)
+    passing = (
+        columns["active"][rows]
+        & tables["category_filter"][category_codes]
+        & tables["location_filter"][location_codes]
+        & (totals >= query["min_followers"])
+        & (totals <= query["max_followers"])
+    )
+    return passing, totals
+
+def score_rows(columns, tables, query, rows, totals):
+    """calculate_business_match_score for candidate rows"""
+    min_followers = query["min_followers"]
+    max_followers = query["max_followers"]
+    scores = (
+        query["category"] * tables["category_hit"][columns["category_codes"][rows]]
+        + query["location"] * tables["location_hit"][columns["location_codes"][rows]]
+        + query["verified"] * columns["verified"][rows]
+        + tables["package_bonus"][columns["package_codes"][rows]]
+    ).astype(np.int64)
+    span = max_followers - min_followers
+    if span:
+        distance = np.abs(totals - (min_followers + max_followers) / 2) / span
+        scores += np.trunc(query["follower_range"] * (1 - distance)).astype(np.int64)
+    else:
+        scores += query["follower_range"]  # every candidate sits exactly on the single allowed value
+    return scores
+
+def rank(rows, scores, totals, limit):
+    """Best `limit` candidates by score, ties broken by row"""
+    if len(rows) > limit:
+        # Keep every row tied with the cut-off score so the lowest rows win, not arbitrary ones
+        cutoff = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+        top = np.flatnonzero(scores >= cutoff)
+    else:
+        top = np.arange(len(rows))
+    order = top[np.lexsort((rows[top], -scores[top]))][:limit]
+    return rows[order], scores[order], totals[order]
+
+def top_matches(columns, tables, query, limit):
+    """Top `limit` rows as (rows, match_scores, total_followers) arrays, best first.
+
+    columns: arrays named in SHARED_COLUMNS
+    tables: per-code lookups category_filter, location_filter, category_hit,
+            location_hit (bool) and package_bonus (int)
+    query: platform_mask, min_followers, max_followers and the category,
+           location, verified and follower_range weights
+    Ties are broken by row so the server and the workers rank identically.
+    """
+    passing, totals = filter_rows(columns, tables, query, slice(None))
+    candidates = np.flatnonzero(passing)
+    if len(candidates) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    totals = totals[candidates]
+    return rank(candidates, score_rows(columns, tables, query, candidates, totals), totals, limit)
+
+def publish_columns(columns):
+    """Copy columns into a new shared memory block; returns (block, layout)"""
+    layout = []
+    offset = 0
+    for name in SHARED_COLUMNS:
+        column = columns[name]
+        layout.append((name, column.dtype.str, column.shape, offset))
+        offset += -(-column.nbytes // 8) * 8  # keep every column 8-byte aligned
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+    for name, dtype, shape, start in layout:
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start)[...] = columns[name]
+    return block, layout
+
+# Worker side: the most recently attached block and its column views
+attached = {}
+
+def attach_columns(block_name, layout):
+    """Column views over a published block, attaching on first use"""
+    entry = attached.get(block_name)
+    if entry is None:
+        for block, columns in attached.values():
+            columns.clear()  # release the views so the old mapping can close
+            block.close()
+        attached.clear()
+        block = shared_memory.SharedMemory(name=block_name)
+        columns = {
+            name: np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start)
+            for name, dtype, shape, start in layout
+        }
+        entry = attached[block_name] = (block, columns)
+    return entry[1]
+
+def shared_top_matches(block_name, layout, tables, query, limit):
+    """top_matches over a published block; runs in pool workers"""
+    return top_matches(attach_columns(block_name, layout), tables, query, limit)
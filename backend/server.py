@@ -1,16 +1,33 @@
 from fastapi import FastAPI, HTTPException, Request, Response, Cookie, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
 import os
+import asyncio
+import time
 from datetime import datetime, timezone, timedelta
 import uuid
 import json
+import base64
+import re
+import zlib
+import bisect
+import itertools
+import functools
+from collections import OrderedDict
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import razorpay
 import hmac
 import hashlib
 from dotenv import load_dotenv
+import match_worker
 
 # Load environment variables from .env file
 load_dotenv()
@@ -25,12 +42,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Matches-Computed-At"],
 )
 
 # MongoDB connection
 MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.environ.get("DB_NAME", "growkro")
 client = AsyncIOMotorClient(MONGO_URL)
-db = client.growkro
+db = client[DB_NAME]
 
 # Razorpay client initialization
 RAZORPAY_KEY_ID = os.environ.get("RAZORPAY_KEY_ID")
@@ -71,6 +90,13 @@ class Creator(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class CreatorSearchResult(Creator):
+    relevance: Optional[float] = None  # MongoDB text score, None for regex fallback
+
+class CreatorMatch(Creator):
+    total_followers: int = 0  # across the business owner's preferred platforms
+    match_score: int = 0
+
 class CreatorCreate(BaseModel):
     name: str
     email: str
@@ -105,6 +131,10 @@ class CreatorUpdate(BaseModel):
     category: Optional[str] = None
     profile_picture: Optional[str] = None
 
+class CreatorBatchGetRequest(BaseModel):
+    ids: List[str]
+    fields: Optional[str] = None  # same format as the fields query parameter
+
 class AdminAction(BaseModel):
     creator_id: str
     action: str  # approve, reject, suspend, activate
@@ -153,6 +183,25 @@ class BusinessOwnerCreate(BaseModel):
     contact_phone: Optional[str] = ""
     website: Optional[str] = ""
 
+class BusinessOwnerUpdate(BaseModel):
+    name: Optional[str] = None
+    company_name: Optional[str] = None
+    company_description: Optional[str] = None
+    industry: Optional[str] = None
+    location: Optional[str] = None
+    budget_range: Optional[str] = None
+    collaboration_type: Optional[str] = None
+    target_audience: Optional[str] = None
+    preferred_platforms: Optional[List[str]] = None
+    min_followers: Optional[int] = None
+    max_followers: Optional[int] = None
+    contact_phone: Optional[str] = None
+    website: Optional[str] = None
+
+class BusinessOwnerMatch(BusinessOwner):
+    total_followers: int = 0  # creator's followers across this business's preferred platforms
+    match_score: int = 0
+
 class CollaborationRequest(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     business_owner_id: str
@@ -220,6 +269,15 @@ class PaymentVerificationRequest(BaseModel):
     payment_id: str
     signature: str
 
+class MatchScoringConfig(BaseModel):
+    """Points awarded by calculate_business_match_score"""
+    category: int = Field(default=30, ge=0)
+    location: int = Field(default=20, ge=0)
+    verified: int = Field(default=15, ge=0)
+    packages: Dict[str, int] = Field(default_factory=lambda: {"platinum": 20, "gold": 15, "silver": 10})
+    follower_range: int = Field(default=15, ge=0)  # awarded in full at the middle of the business's range
+    semantic: int = Field(default=30, ge=0)  # times text similarity, semantic engine only
+
 # Helper functions
 def prepare_for_mongo(data):
     """Convert datetime objects to ISO strings for MongoDB storage"""
@@ -237,6 +295,369 @@ def parse_from_mongo(item):
         item['updated_at'] = datetime.fromisoformat(item['updated_at'])
     return item
 
+# Normalized filter fields
+# category/location/industry are free text; each gets a case-folded, trimmed and
+# canonicalized *_norm companion so filters become anchored (index) prefix seeks.
+FACET_ALIASES = {
+    "technology": "tech",
+    "gadgets": "tech",
+    "clothing": "fashion",
+    "apparel": "fashion",
+    "beauty and makeup": "beauty",
+    "makeup": "beauty",
+    "food and drink": "food",
+    "travel and tourism": "travel",
+    "bengaluru": "bangalore",
+    "bombay": "mumbai",
+    "new delhi": "delhi",
+    "gurugram": "gurgaon",
+    "calcutta": "kolkata",
+    "madras": "chennai"
+}
+
+# Bump when derive_*_fields change so backfill_derived_fields rewrites old documents
+DERIVED_FIELDS_VERSION = 3
+
+# Follower count field per platform
+PLATFORM_FOLLOWER_FIELDS = {
+    "instagram": "instagram_followers",
+    "youtube": "youtube_subscribers",
+    "twitter": "twitter_followers",
+    "tiktok": "tiktok_followers",
+    "snapchat": "snapchat_followers"
+}
+
+# Short codes used to name a set of platforms, e.g. "ig_yt" for instagram + youtube
+PLATFORM_CODES = {
+    "instagram": "ig",
+    "youtube": "yt",
+    "twitter": "tw",
+    "tiktok": "tt",
+    "snapchat": "sc"
+}
+
+def platform_set_key(platforms: Optional[List[str]]) -> Optional[str]:
+    """Key of platform_sums for a preferred platform list (empty means all platforms).
+
+    Returns None when none of the listed platforms is known, i.e. nothing can match.
+    """
+    selected = [p for p in PLATFORM_CODES if not platforms or p in platforms]
+    return "_".join(PLATFORM_CODES[p] for p in selected) if selected else None
+
+def platform_sums(creator: Dict) -> Dict:
+    """Follower sum for every non-empty subset of platforms, keyed by platform_set_key"""
+    followers = {p: creator.get(field) or 0 for p, field in PLATFORM_FOLLOWER_FIELDS.items()}
+    sums = {}
+    for size in range(1, len(PLATFORM_CODES) + 1):
+        for subset in itertools.combinations(PLATFORM_CODES, size):
+            sums[platform_set_key(list(subset))] = sum(followers[p] for p in subset)
+    return sums
+
+# Fields a follower range can be applied to: one platform, the largest or the sum
+FOLLOWER_RANGE_FIELDS = {
+    **PLATFORM_FOLLOWER_FIELDS,
+    "max": "followers_max",
+    "total": "followers_total"
+}
+
+def normalize_facet(value: Optional[str]) -> str:
+    """Case-fold, trim and canonicalize a category/location/industry value"""
+    if not value:
+        return ""
+    value = value.casefold().replace("&", " and ")
+    parts = [" ".join(part.split()) for part in value.split(",")]
+    return ", ".join(FACET_ALIASES.get(part, part) for part in parts if part)
+
+def prefix_match(value: Optional[str]):
+    """Anchored, case-sensitive regex on a *_norm field; MongoDB turns it into an index range"""
+    normalized = normalize_facet(value)
+    return {"$regex": "^" + re.escape(normalized)} if normalized else None
+
+def derive_creator_fields(creator: Dict) -> Dict:
+    """Companion fields stored alongside a creator document"""
+    followers = [creator.get(field) or 0 for field in PLATFORM_FOLLOWER_FIELDS.values()]
+    return {
+        "category_norm": normalize_facet(creator.get("category")),
+        "location_norm": normalize_facet(creator.get("location")),
+        "followers_max": max(followers),
+        "followers_total": sum(followers),
+        "platform_sums": platform_sums(creator),
+        "derived_version": DERIVED_FIELDS_VERSION
+    }
+
+def derive_business_fields(business: Dict) -> Dict:
+    """Companion fields stored alongside a business owner document"""
+    return {
+        "industry_norm": normalize_facet(business.get("industry")),
+        "location_norm": normalize_facet(business.get("location")),
+        "derived_version": DERIVED_FIELDS_VERSION
+    }
+
+DERIVED_FIELDS = {
+    "creators": derive_creator_fields,
+    "business_owners": derive_business_fields
+}
+
+async def backfill_derived_fields(collection_name: str, batch_size: int = 500):
+    """Recompute derived fields for documents written before the current version"""
+    derive = DERIVED_FIELDS[collection_name]
+    cursor = db[collection_name].find({"derived_version": {"$ne": DERIVED_FIELDS_VERSION}})
+    updated = 0
+    batch = []
+    async for document in cursor:
+        batch.append(UpdateOne({"_id": document["_id"]}, {"$set": derive(document)}))
+        if len(batch) >= batch_size:
+            await db[collection_name].bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    if batch:
+        await db[collection_name].bulk_write(batch, ordered=False)
+        updated += len(batch)
+    return updated
+
+async def backfill_all_derived_fields():
+    """Backfill derived fields on every collection that has them"""
+    results = {}
+    for collection_name in DERIVED_FIELDS:
+        try:
+            results[collection_name] = await backfill_derived_fields(collection_name)
+        except Exception as e:
+            print(f"Error backfilling {collection_name}: {str(e)}")
+            results[collection_name] = f"error: {str(e)}"
+    return results
+
+# Keyset pagination
+# Sort orders always end with "id" so the key is unique and the cursor stable
+CREATOR_SORTS = {
+    "newest": [("created_at", -1), ("id", -1)],
+    "followers": [("instagram_followers", -1), ("id", -1)]
+}
+NEWEST_FIRST = [("created_at", -1), ("id", -1)]
+
+def encode_cursor(document, sort_keys, sort_name="newest"):
+    """Build an opaque cursor from the sort key values of the last document on a page"""
+    values = []
+    for field, _ in sort_keys:
+        value = document.get(field)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    payload = json.dumps({"s": sort_name, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor, sort_keys, sort_name="newest"):
+    """Decode a cursor produced by encode_cursor for the same sort order"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if payload.get("s") != sort_name or len(values) != len(sort_keys):
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort order")
+    return values
+
+def keyset_filter(sort_keys, values):
+    """Match documents strictly after the cursor position in the given sort order"""
+    clauses = []
+    for position, (field, direction) in enumerate(sort_keys):
+        clause = {prefix_field: values[i] for i, (prefix_field, _) in enumerate(sort_keys[:position])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+def apply_cursor(filter_query, cursor, sort_keys, sort_name="newest"):
+    """Combine a filter with the keyset condition of a cursor"""
+    if not cursor:
+        return filter_query
+    condition = keyset_filter(sort_keys, decode_cursor(cursor, sort_keys, sort_name))
+    return {"$and": [filter_query, condition]} if filter_query else condition
+
+def next_cursor(documents, limit, sort_keys, sort_name="newest"):
+    """Cursor for the following page, or None when this page was the last one"""
+    if not documents or len(documents) < limit:
+        return None
+    return encode_cursor(documents[-1], sort_keys, sort_name)
+
+# Sparse fieldsets
+CREATOR_FIELDS = list(Creator.model_fields)
+CREATOR_FIELD_PRESETS = {
+    # Everything a creator card on the homepage renders
+    "card": ["id", "name", "profile_picture", "category", "location",
+             "instagram_followers", "highlight_package", "verification_status"]
+}
+
+def creator_projection(fields: Optional[str], required: Optional[List[str]] = None):
+    """Translate a comma separated `fields` parameter into a MongoDB projection.
+
+    Returns (projection, requested); both are None when no fields were asked for.
+    `required` lists fields the endpoint itself needs (sort keys, scoring inputs)
+    which are fetched but not returned unless requested.
+    """
+    if not fields:
+        return None, None
+
+    requested = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name in CREATOR_FIELD_PRESETS:
+            names = CREATOR_FIELD_PRESETS[name]
+        elif name in CREATOR_FIELDS:
+            names = [name]
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+        requested += [n for n in names if n not in requested]
+
+    projection = {"_id": 0}
+    for name in requested + (required or []):
+        projection[name] = 1
+    return projection, requested
+
+def sparse_document(document, requested, extra: Optional[List[str]] = None):
+    """Reduce a projected document to the requested fields (plus computed extras)"""
+    keys = requested + (extra or [])
+    return {key: document[key] for key in keys if key in document}
+
+# Response caching
+class TTLCache:
+    """Bounded LRU cache whose entries expire.
+
+    An entry is fresh for `ttl` seconds, then may be served stale for another
+    `stale_ttl` seconds while it is recomputed.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 128, stale_ttl: float = 0.0):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self.entries = OrderedDict()  # key -> (value, fresh_until, stale_until)
+        self.generation = 0  # bumped by invalidate so in-flight results are not stored
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(self, key):
+        """Look up a key; returns (value, state) with state fresh, stale or miss"""
+        entry = self.entries.get(key)
+        now = time.monotonic()
+        if entry is None or now >= entry[2]:
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None, "miss"
+        self.entries.move_to_end(key)
+        if now < entry[1]:
+            self.hits += 1
+            return entry[0], "fresh"
+        self.stale_hits += 1
+        return entry[0], "stale"
+
+    def get(self, key):
+        """Fresh value or None"""
+        value, state = self.lookup(key)
+        return value if state == "fresh" else None
+
+    def put(self, key, value):
+        now = time.monotonic()
+        self.entries[key] = (value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, stale: bool = False):
+        """Drop every entry, or with stale=True only end their freshness so they refresh in the background"""
+        self.generation += 1
+        self.invalidations += 1
+        if stale:
+            for key, (value, _, stale_until) in self.entries.items():
+                self.entries[key] = (value, 0, stale_until)
+        else:
+            self.entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+# Endpoint caches by name, for invalidation and metrics
+response_caches = {}
+
+def cached_response(name: str, ttl: float, maxsize: int = 128, stale_ttl: float = 0.0):
+    """Cache an async endpoint's result per distinct arguments.
+
+    Stale entries are returned immediately while one background task refreshes
+    them; concurrent misses for the same arguments share one computation.
+    Errors (including HTTPException) are never cached.
+    """
+    cache = response_caches[name] = TTLCache(name, ttl, maxsize, stale_ttl)
+    
+    def decorator(endpoint):
+        pending = {}  # key -> future of the computation in flight
+        
+        def compute(key, kwargs):
+            future = pending.get(key)
+            if future is None:
+                generation = cache.generation
+                future = pending[key] = asyncio.ensure_future(endpoint(**kwargs))
+                
+                def store(done):
+                    pending.pop(key, None)
+                    if done.cancelled() or done.exception() is not None:
+                        cache.errors += 1
+                    elif cache.generation == generation:
+                        cache.put(key, done.result())
+                future.add_done_callback(store)
+            return future
+        
+        async def refresh(key, kwargs):
+            try:
+                await compute(key, kwargs)
+            except Exception as e:
+                print(f"Error refreshing {name} cache: {str(e)}")
+        
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            key = tuple(sorted(kwargs.items()))
+            value, state = cache.lookup(key)
+            if state == "fresh":
+                return value
+            if state == "stale":
+                if key not in pending:
+                    cache.refreshes += 1
+                    start_background_task(refresh(key, kwargs))
+                return value
+            return await asyncio.shield(compute(key, kwargs))
+        
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+def invalidate_response_caches(*names: str, stale: bool = True):
+    """Called by write handlers; by default cached responses are refreshed in the background"""
+    for name in names:
+        response_caches[name].invalidate(stale=stale)
+
+# Endpoints whose responses are derived from creator counts
+CREATOR_STATS_CACHES = ["platform_stats", "user_management_stats", "analytics_dashboard"]
+
 # Payment pricing configuration (amounts in paise)
 PAYMENT_PRICING = {
     "subscription": {
@@ -312,6 +733,1410 @@ HIGHLIGHT_PACKAGES = [
     }
 ]
 
+# Database Indexes
+# Every query shape used by the routes below is declared here so that it is
+# served by an index. Names are explicit so drift can be detected by name.
+DATABASE_INDEXES = {
+    "creators": [
+        {"name": "creators_id_unique", "keys": [("id", 1)], "unique": True,
+         "queries": ["get_creator", "batch_get_creators", "update_creator", "delete_creator", "approve_creator", "upgrade_creator_package"]},
+        {"name": "creators_email_unique", "keys": [("email", 1)], "unique": True,
+         "queries": ["create_creator"]},
+        {"name": "creators_package_status_followers", "keys": [("highlight_package", 1), ("profile_status", 1), ("instagram_followers", -1)],
+         "queries": ["get_creators_by_package", "get_creators(package)", "get_platform_stats"]},
+        {"name": "creators_created_id", "keys": [("created_at", -1), ("id", -1)],
+         "queries": ["get_creators(sort=newest)"]},
+        {"name": "creators_followers_id", "keys": [("instagram_followers", -1), ("id", -1)],
+         "queries": ["get_creators(sort=followers)"]},
+        {"name": "creators_category_location", "keys": [("category_norm", 1), ("location_norm", 1)],
+         "queries": ["get_creators(category, location)", "search_creators(category, location)"]},
+        {"name": "creators_location", "keys": [("location_norm", 1)],
+         "queries": ["get_creators(location)", "search_creators(location)"]},
+        {"name": "creators_status_category_location", "keys": [("profile_status", 1), ("category_norm", 1), ("location_norm", 1)],
+         "queries": ["match_creators_for_business"]},
+        {"name": "creators_followers_max", "keys": [("followers_max", -1)],
+         "queries": ["search_creators(platform=max)"]},
+        {"name": "creators_followers_total", "keys": [("followers_total", -1)],
+         "queries": ["search_creators(platform=total)"]},
+        {"name": "creators_youtube_subscribers", "keys": [("youtube_subscribers", -1)],
+         "queries": ["search_creators(platform=youtube)"]},
+        {"name": "creators_twitter_followers", "keys": [("twitter_followers", -1)],
+         "queries": ["search_creators(platform=twitter)"]},
+        {"name": "creators_tiktok_followers", "keys": [("tiktok_followers", -1)],
+         "queries": ["search_creators(platform=tiktok)"]},
+        {"name": "creators_snapchat_followers", "keys": [("snapchat_followers", -1)],
+         "queries": ["search_creators(platform=snapchat)"]},
+        {"name": "creators_platform_sums", "keys": [("platform_sums.$**", 1)],
+         "queries": ["match_creators_for_business(engine=database)"]},
+        {"name": "creators_status", "keys": [("profile_status", 1)],
+         "queries": ["get_pending_creators", "get_user_management_stats", "send_notification"]},
+        {"name": "creators_verification_status", "keys": [("verification_status", 1)],
+         "queries": ["get_creators(verified_only)", "get_platform_stats"]},
+        {"name": "creators_text_search", "keys": [("name", "text"), ("category", "text"), ("bio", "text")],
+         "weights": {"name": 10, "category": 5, "bio": 1},
+         "queries": ["search_creators(q)"]},
+    ],
+    "business_owners": [
+        {"name": "business_owners_id_unique", "keys": [("id", 1)], "unique": True,
+         "queries": ["get_business_owner", "match_creators_for_business", "create_collaboration_request"]},
+        {"name": "business_owners_email_unique", "keys": [("email", 1)], "unique": True,
+         "queries": ["create_business_owner"]},
+        {"name": "business_owners_status_created_id", "keys": [("profile_status", 1), ("created_at", -1), ("id", -1)],
+         "queries": ["get_business_owners"]},
+        {"name": "business_owners_status_industry_location", "keys": [("profile_status", 1), ("industry_norm", 1), ("location_norm", 1)],
+         "queries": ["get_business_owners(industry, location)"]},
+        {"name": "business_owners_status_location", "keys": [("profile_status", 1), ("location_norm", 1)],
+         "queries": ["get_business_owners(location)"]},
+    ],
+    "payment_transactions": [
+        {"name": "payment_transactions_order_id_unique", "keys": [("order_id", 1)], "unique": True,
+         "queries": ["verify_payment", "get_transaction_status"]},
+        {"name": "payment_transactions_status_created_id", "keys": [("status", 1), ("created_at", -1), ("id", -1)],
+         "queries": ["get_all_transactions(status)"]},
+        {"name": "payment_transactions_created_id", "keys": [("created_at", -1), ("id", -1)],
+         "queries": ["get_all_transactions"]},
+        {"name": "payment_transactions_revenue", "keys": [("status", 1), ("created_at", 1), ("payment_type", 1), ("amount", 1)],
+         "queries": ["aggregate_revenue (covered)"]},
+    ],
+    "collaboration_requests": [
+        {"name": "collaboration_requests_id_unique", "keys": [("id", 1)], "unique": True,
+         "queries": ["respond_to_collaboration_request"]},
+        {"name": "collaboration_requests_creator_created", "keys": [("creator_id", 1), ("created_at", -1)],
+         "queries": ["get_creator_collaboration_requests"]},
+    ],
+    "otps": [
+        {"name": "otps_email_otp_unverified", "keys": [("email", 1), ("otp", 1)],
+         "partialFilterExpression": {"verified": False},
+         "queries": ["verify_otp"]},
+    ],
+    "creator_matches": [
+        {"name": "creator_matches_business_unique", "keys": [("business_owner_id", 1)], "unique": True,
+         "queries": ["match_creators_for_business(engine=table)", "refresh_match_table"]},
+    ],
+    "app_settings": [
+        {"name": "app_settings_key_unique", "keys": [("key", 1)], "unique": True,
+         "queries": ["match_scoring_reload_loop", "update_match_scoring"]},
+    ],
+    "revenue_rollups": [
+        {"name": "revenue_rollups_granularity_period", "keys": [("granularity", 1), ("period", 1)],
+         "queries": ["get_revenue_timeseries", "current_month_revenue"]},
+    ],
+    "notifications": [
+        {"name": "notifications_sent_at", "keys": [("sent_at", -1)],
+         "queries": ["get_notification_history"]},
+    ],
+}
+
+INDEX_OPTION_KEYS = ["unique", "partialFilterExpression", "sparse", "expireAfterSeconds", "weights"]
+
+# Result of the most recent reconciliation, exposed via the admin endpoint
+index_report = {"status": "not_started", "last_reconciled_at": None, "collections": {}}
+
+def index_key(keys):
+    """Normalize index keys the way MongoDB reports them (text fields collapse into _fts/_ftsx)"""
+    normalized = []
+    for field, direction in keys:
+        if direction == "text":
+            if ("_fts", "text") not in normalized:
+                normalized += [("_fts", "text"), ("_ftsx", 1)]
+        elif field not in ("_fts", "_ftsx"):
+            normalized.append((field, direction))
+    return normalized
+
+def index_options(spec):
+    """Extract the creation options of an index spec or an index_information() entry"""
+    return {key: spec[key] for key in INDEX_OPTION_KEYS if spec.get(key) not in (None, False)}
+
+async def inspect_indexes(collection_name: str):
+    """Compare declared indexes of a collection with the ones present in MongoDB"""
+    existing = await db[collection_name].index_information()
+    declared = DATABASE_INDEXES.get(collection_name, [])
+
+    missing, mismatched = [], []
+    for spec in declared:
+        current = existing.get(spec["name"])
+        if current is None:
+            missing.append(spec["name"])
+        elif index_key(current["key"]) != index_key(spec["keys"]) or index_options(current) != index_options(spec):
+            mismatched.append(spec["name"])
+
+    declared_names = {spec["name"] for spec in declared}
+    extra = [name for name in existing if name != "_id_" and name not in declared_names]
+
+    return {"missing": missing, "mismatched": mismatched, "extra": extra}
+
+async def reconcile_indexes():
+    """Create missing indexes for every declared collection and record drift"""
+    index_report["status"] = "running"
+    collections = {}
+    for collection_name, specs in DATABASE_INDEXES.items():
+        errors = []
+        try:
+            drift = await inspect_indexes(collection_name)
+            created = []
+            for spec in specs:
+                if spec["name"] not in drift["missing"]:
+                    continue
+                try:
+                    await db[collection_name].create_index(
+                        spec["keys"], name=spec["name"], background=True, **index_options(spec)
+                    )
+                    created.append(spec["name"])
+                except Exception as e:
+                    errors.append(f"{spec['name']}: {str(e)}")
+            if created:
+                drift = await inspect_indexes(collection_name)
+            drift["created"] = created
+        except Exception as e:
+            drift = {"missing": [], "mismatched": [], "extra": [], "created": []}
+            errors.append(str(e))
+        drift["errors"] = errors
+        collections[collection_name] = drift
+        if drift["mismatched"] or errors:
+            print(f"Index drift on {collection_name}: mismatched={drift['mismatched']} errors={errors}")
+
+    index_report["collections"] = collections
+    index_report["last_reconciled_at"] = datetime.now(timezone.utc).isoformat()
+    index_report["status"] = "completed"
+    return index_report
+
+# In-memory Creator Indexes
+SUGGEST_MAX_ENTRIES = int(os.environ.get("SUGGEST_MAX_ENTRIES", "1000000"))
+SUGGEST_MAX_KEY_LENGTH = 64
+SUGGEST_HANDLE_FIELDS = ["instagram_handle", "youtube_handle", "twitter_handle", "tiktok_handle", "snapchat_handle"]
+
+def normalize_suggest_key(value: Optional[str]) -> str:
+    """Lowercase, collapse whitespace and drop a leading @ from a name or handle"""
+    if not value:
+        return ""
+    return " ".join(value.casefold().split()).lstrip("@")[:SUGGEST_MAX_KEY_LENGTH]
+
+def suggestion_keys(creator: Dict) -> List[str]:
+    """Prefix keys for a creator: full name, every later word of it, and social handles"""
+    keys = []
+    name = normalize_suggest_key(creator.get("name"))
+    if name:
+        words = name.split(" ")
+        keys += [" ".join(words[i:]) for i in range(len(words))]
+    for field in SUGGEST_HANDLE_FIELDS:
+        handle = normalize_suggest_key(creator.get(field))
+        if handle:
+            keys.append(handle)
+    return list(dict.fromkeys(keys))
+
+class PrefixIndex:
+    """Sorted array of (key, creator_id) pairs answering prefix lookups with bisect.
+
+    Memory is bounded by max_entries; creators added once the index is full are
+    skipped (and reported via `dropped`) until entries are removed.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = []
+        self.keys_by_creator = {}
+        self.names = {}
+        self.dropped = 0
+        self.ready = False
+
+    def add(self, creator_id: str, keys: List[str], name: str):
+        """Insert or replace the keys of a creator"""
+        self.remove(creator_id)
+        if len(self.entries) + len(keys) > self.max_entries:
+            self.dropped += 1
+            return
+        for key in keys:
+            bisect.insort(self.entries, (key, creator_id))
+        self.keys_by_creator[creator_id] = keys
+        self.names[creator_id] = name
+
+    def remove(self, creator_id: str):
+        """Drop every key of a creator"""
+        for key in self.keys_by_creator.pop(creator_id, []):
+            position = bisect.bisect_left(self.entries, (key, creator_id))
+            if position < len(self.entries) and self.entries[position] == (key, creator_id):
+                del self.entries[position]
+        self.names.pop(creator_id, None)
+
+    def search(self, prefix: str, limit: int) -> List[Dict]:
+        """Creators with a key starting with prefix, in key order, one row per creator"""
+        results, seen = [], set()
+        position = bisect.bisect_left(self.entries, (prefix,))
+        while position < len(self.entries) and len(results) < limit:
+            key, creator_id = self.entries[position]
+            if not key.startswith(prefix):
+                break
+            if creator_id not in seen:
+                seen.add(creator_id)
+                results.append({"id": creator_id, "name": self.names.get(creator_id, ""), "match": key})
+            position += 1
+        return results
+
+    def load(self, rows):
+        """Replace the whole index from (creator_id, keys, name) rows in one sort"""
+        entries, keys_by_creator, names, dropped = [], {}, {}, 0
+        for creator_id, keys, name in rows:
+            if len(entries) + len(keys) > self.max_entries:
+                dropped += 1
+                continue
+            entries += [(key, creator_id) for key in keys]
+            keys_by_creator[creator_id] = keys
+            names[creator_id] = name
+        entries.sort()
+        self.entries, self.keys_by_creator, self.names, self.dropped = entries, keys_by_creator, names, dropped
+        self.ready = True
+
+suggest_index = PrefixIndex(SUGGEST_MAX_ENTRIES)
+
+async def build_suggest_index():
+    """Load creator names and handles into the typeahead index"""
+    log = open_write_log(creator_write_logs)
+    try:
+        projection = {"_id": 0, "id": 1, "name": 1, **{field: 1 for field in SUGGEST_HANDLE_FIELDS}}
+        rows = []
+        async for creator in db.creators.find({}, projection):
+            rows.append((creator["id"], suggestion_keys(creator), creator.get("name", "")))
+        suggest_index.load(rows)
+        for before, after in log:
+            sync_suggest_index(before, after)
+    except Exception as e:
+        print(f"Error building suggest index: {str(e)}")
+    finally:
+        close_write_log(creator_write_logs, log)
+
+# Homepage showcases: top creators per highlight package, ordered by Instagram followers
+TIER_PACKAGES = ["silver", "gold", "platinum"]
+TIER_SHOWCASE_SIZE = 50
+TIER_SHOWCASE_REFRESH_SECONDS = 600
+
+tier_showcases = {}  # package_id -> {"creators": [documents], "refreshed_at": iso string}
+tier_refresh_pending = set()
+
+async def refresh_tier_showcase(package_id: str):
+    """Reload the top creators of one package (an indexed, limited query)"""
+    cursor = db.creators.find(
+        {"highlight_package": package_id, "profile_status": "approved"}, {"_id": 0}
+    ).sort("instagram_followers", -1).limit(TIER_SHOWCASE_SIZE)
+    tier_showcases[package_id] = {
+        "creators": await cursor.to_list(length=TIER_SHOWCASE_SIZE),
+        "refreshed_at": datetime.now(timezone.utc).isoformat()
+    }
+
+async def refresh_pending_tier_showcase(package_id: str):
+    """Run a scheduled refresh; writes arriving meanwhile schedule another one"""
+    tier_refresh_pending.discard(package_id)
+    try:
+        await refresh_tier_showcase(package_id)
+    except Exception as e:
+        print(f"Error refreshing {package_id} showcase: {str(e)}")
+
+def schedule_tier_refresh(package_id: str):
+    """Refresh a showcase in the background, collapsing bursts of writes into one query"""
+    if package_id not in TIER_PACKAGES or package_id in tier_refresh_pending:
+        return
+    tier_refresh_pending.add(package_id)
+    start_background_task(refresh_pending_tier_showcase(package_id))
+
+async def tier_showcase_loop():
+    """Rebuild every showcase periodically in case a write was missed"""
+    while True:
+        for package_id in TIER_PACKAGES:
+            try:
+                await refresh_tier_showcase(package_id)
+            except Exception as e:
+                print(f"Error refreshing {package_id} showcase: {str(e)}")
+        await asyncio.sleep(TIER_SHOWCASE_REFRESH_SECONDS)
+
+# Match scoring weights, stored in app_settings so they can change without a redeploy
+MATCH_SCORING_SETTINGS_KEY = "match_scoring"
+MATCH_SCORING_RELOAD_SECONDS = 60
+
+match_scoring = MatchScoringConfig()
+
+def apply_match_scoring(config: MatchScoringConfig) -> bool:
+    """Switch every engine to new weights; returns whether anything changed"""
+    global match_scoring
+    if config == match_scoring:
+        return False
+    match_scoring = config
+    # Stored match tables and cached results were scored with the old weights
+    mark_match_tables_dirty(list(business_match_index.businesses))
+    match_cache.bump_directory()
+    return True
+
+async def match_scoring_reload_loop():
+    """Pick up weights saved by any server process"""
+    while True:
+        try:
+            settings = await db.app_settings.find_one({"key": MATCH_SCORING_SETTINGS_KEY})
+            if settings:
+                apply_match_scoring(MatchScoringConfig(**settings["value"]))
+        except Exception as e:
+            print(f"Error loading match scoring weights: {str(e)}")
+        await asyncio.sleep(MATCH_SCORING_RELOAD_SECONDS)
+
+# Matching features of approved creators as column arrays, scored in one NumPy pass
+MATCH_PLATFORMS = list(PLATFORM_FOLLOWER_FIELDS)
+
+class ValueDictionary:
+    """Dictionary encoding of free-text values, keeping raw and normalized forms per code"""
+
+    def __init__(self):
+        self.codes = {"": 0}
+        self.raw = [""]
+        self.normalized = [""]
+
+    def encode(self, value: Optional[str]) -> int:
+        value = value or ""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.raw)
+            self.codes[value] = code
+            self.raw.append(value)
+            self.normalized.append(normalize_facet(value))
+        return code
+
+    def table(self, predicate) -> np.ndarray:
+        """Boolean lookup table of predicate(raw, normalized) indexed by code"""
+        return np.fromiter((predicate(r, n) for r, n in zip(self.raw, self.normalized)), dtype=bool, count=len(self.raw))
+
+class CreatorColumns:
+    """Column store of approved creators for vectorized matching.
+
+    Rows are addressed by slot; deleted rows are deactivated and their slot reused.
+    Categories and locations are dictionary-encoded so per-business string checks
+    run once per distinct value instead of once per creator.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.slots = {}
+        self.free_slots = []
+        self.size = 0
+        self.ready = False
+        self.version = 0
+        self.ids = np.empty(capacity, dtype=object)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.followers = np.zeros((capacity, len(MATCH_PLATFORMS)), dtype=np.int64)
+        self.package_codes = np.zeros(capacity, dtype=np.int32)
+        self.verified = np.zeros(capacity, dtype=bool)
+        self.category_codes = np.zeros(capacity, dtype=np.int32)
+        self.location_codes = np.zeros(capacity, dtype=np.int32)
+        self.categories = ValueDictionary()
+        self.locations = ValueDictionary()
+        self.packages = ValueDictionary()
+
+    def _grow(self):
+        capacity = len(self.active) * 2
+        for name in ["ids", "active", "followers", "package_codes", "verified", "category_codes", "location_codes"]:
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def upsert(self, creator: Dict):
+        """Insert or overwrite the row of a creator"""
+        creator_id = creator["id"]
+        slot = self.slots.get(creator_id)
+        if slot is None:
+            if self.free_slots:
+                slot = self.free_slots.pop()
+            else:
+                if self.size == len(self.active):
+                    self._grow()
+                slot = self.size
+                self.size += 1
+            self.slots[creator_id] = slot
+        self.ids[slot] = creator_id
+        self.active[slot] = True
+        self.followers[slot] = [creator.get(PLATFORM_FOLLOWER_FIELDS[p]) or 0 for p in MATCH_PLATFORMS]
+        self.package_codes[slot] = self.packages.encode(creator.get("highlight_package"))
+        self.verified[slot] = bool(creator.get("verification_status"))
+        self.category_codes[slot] = self.categories.encode(creator.get("category"))
+        self.location_codes[slot] = self.locations.encode(creator.get("location"))
+        self.version += 1
+
+    def remove(self, creator_id: str):
+        """Deactivate the row of a creator and recycle its slot"""
+        slot = self.slots.pop(creator_id, None)
+        if slot is None:
+            return
+        self.active[slot] = False
+        self.ids[slot] = None
+        self.free_slots.append(slot)
+        self.version += 1
+
+    def load(self, creators):
+        """Replace all rows"""
+        fresh = CreatorColumns(max(1024, len(creators)))
+        for creator in creators:
+            fresh.upsert(creator)
+        fresh.ready = True
+        fresh.version = self.version + 1
+        self.__dict__.update(fresh.__dict__)
+
+    def match_query(self, business_owner: Dict):
+        """Lookup tables and query for match_worker.top_matches, or None when nothing can match.
+
+        String checks run once per distinct value: the filter uses normalized
+        prefixes, the score raw containment, as calculate_business_match_score does.
+        """
+        weights = match_scoring
+        industry = (business_owner.get("industry") or "").lower()
+        location = (business_owner.get("location") or "").lower()
+        industry_norm = normalize_facet(business_owner.get("industry"))
+        location_norm = normalize_facet(business_owner.get("location"))
+        preferred = business_owner.get("preferred_platforms") or []
+        min_followers = business_owner.get("min_followers")
+        max_followers = business_owner.get("max_followers")
+
+        platform_mask = np.array([not preferred or p in preferred for p in MATCH_PLATFORMS])
+        if not platform_mask.any():
+            return None
+
+        tables = {
+            "category_filter": self.categories.table(lambda raw, norm: norm.startswith(industry_norm)),
+            "location_filter": self.locations.table(lambda raw, norm: norm.startswith(location_norm)),
+            "category_hit": self.categories.table(lambda raw, norm: industry in raw.lower()),
+            "location_hit": self.locations.table(lambda raw, norm: location in raw.lower()),
+            "package_bonus": np.array([weights.packages.get(raw, 0) for raw in self.packages.raw], dtype=np.int64)
+        }
+        query = {
+            "platform_mask": platform_mask,
+            "min_followers": 0 if min_followers is None else min_followers,
+            "max_followers": 1000000 if max_followers is None else max_followers,
+            "category": weights.category,
+            "location": weights.location,
+            "verified": weights.verified,
+            "follower_range": weights.follower_range
+        }
+        return tables, query
+
+    def columns(self) -> Dict:
+        """Views of the rows in use, keyed as match_worker expects"""
+        return {name: getattr(self, name)[:self.size] for name in match_worker.SHARED_COLUMNS}
+
+    def blended_matches(self, business_owner: Dict, creator_ids, similarities, limit: int):
+        """Top `limit` of the given creators with text similarity blended into the score.
+
+        The category filter is dropped (similarity replaces it); location and
+        follower requirements still apply.
+        """
+        prepared = self.match_query(business_owner)
+        if prepared is None or limit <= 0:
+            return []
+        tables, query = prepared
+        tables["category_filter"] = np.ones_like(tables["category_filter"])
+        rows = np.array([self.slots.get(creator_id, -1) for creator_id in creator_ids], dtype=np.int64)
+        known = rows >= 0
+        rows, similarities = rows[known], np.asarray(similarities)[known]
+        columns = self.columns()
+        passing, totals = match_worker.filter_rows(columns, tables, query, rows)
+        rows, totals, similarities = rows[passing], totals[passing], similarities[passing]
+        if len(rows) == 0:
+            return []
+        scores = match_worker.score_rows(columns, tables, query, rows, totals)
+        scores += np.trunc(match_scoring.semantic * np.clip(similarities, 0, 1)).astype(np.int64)
+        rows, scores, totals = match_worker.rank(rows, scores, totals, limit)
+        return [(self.ids[row], int(score), int(total)) for row, score, total in zip(rows, scores, totals)]
+
+    def top_matches(self, business_owner: Dict, limit: int):
+        """Top `limit` (creator_id, match_score, total_followers) for a business owner.
+
+        Applies the same filter as the scan engine and produces exactly the scores of
+        calculate_business_match_score, ordered by score then row.
+        """
+        if self.size == 0 or limit <= 0:
+            return []
+        prepared = self.match_query(business_owner)
+        if prepared is None:
+            return []
+        rows, scores, totals = match_worker.top_matches(self.columns(), *prepared, limit)
+        return [(self.ids[row], int(score), int(total)) for row, score, total in zip(rows, scores, totals)]
+
+    async def top_matches_in_thread(self, business_owner: Dict, limit: int):
+        """top_matches with the scoring run in the default executor.
+
+        Lookup tables are prepared on the event loop. Rows written while the thread
+        scores may or may not be seen; rows removed meanwhile are dropped.
+        """
+        if self.size == 0 or limit <= 0:
+            return []
+        prepared = self.match_query(business_owner)
+        if prepared is None:
+            return []
+        ids = self.ids
+        rows, scores, totals = await asyncio.get_running_loop().run_in_executor(
+            None, match_worker.top_matches, self.columns(), *prepared, limit
+        )
+        return [
+            (ids[row], int(score), int(total))
+            for row, score, total in zip(rows, scores, totals)
+            if ids[row] is not None
+        ]
+
+creator_columns = CreatorColumns()
+
+# Match pool: score in worker processes over shared-memory snapshots of creator_columns
+MATCH_POOL_WORKERS = int(os.environ.get("MATCH_POOL_WORKERS", "0"))
+MATCH_POOL_PUBLISH_SECONDS = 1.0
+
+class MatchPool:
+    """Process pool scoring matches off the event loop.
+
+    Workers attach to the latest snapshot of the creator columns by shared memory
+    name, so a request only ships the small per-business lookup tables. Snapshots
+    are republished in a thread at most every MATCH_POOL_PUBLISH_SECONDS after a
+    write; older ones stay linked until the last request using them finishes.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.executor = None
+        self.snapshots = []  # (block, layout, ids, version), newest last
+        self.in_flight = {}  # block name -> requests still using that snapshot
+        self.published_at = 0.0
+        self.publishing = None
+
+    @property
+    def ready(self) -> bool:
+        return self.executor is not None and creator_columns.ready
+
+    def start(self):
+        # Spawned workers only import match_worker, never the server
+        self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def snapshot(self):
+        """Current snapshot; starts a republish if creator_columns changed since"""
+        latest = self.snapshots[-1] if self.snapshots else None
+        stale = latest is None or latest[3] != creator_columns.version
+        if stale and self.publishing is None and (latest is None or time.monotonic() - self.published_at >= MATCH_POOL_PUBLISH_SECONDS):
+            self.publishing = asyncio.ensure_future(self._publish())
+        if latest is None:
+            await asyncio.shield(self.publishing)
+            latest = self.snapshots[-1]
+        return latest
+
+    @staticmethod
+    def _copy(columns, ids):
+        block, layout = match_worker.publish_columns(columns)
+        return block, layout, ids.copy()
+
+    async def _publish(self):
+        """Copy creator_columns into a new block in a thread and make it the newest snapshot"""
+        try:
+            # A write landing during the copy leaves the version stale, so it is republished later
+            version = creator_columns.version
+            block, layout, ids = await asyncio.get_running_loop().run_in_executor(
+                None, self._copy, creator_columns.columns(), creator_columns.ids[:creator_columns.size]
+            )
+            self.snapshots.append((block, layout, ids, version))
+            self.in_flight[block.name] = 0
+            self.published_at = time.monotonic()
+            if self.executor is None:  # shut down while copying
+                self.shutdown()
+            self._release_idle()
+        finally:
+            self.publishing = None
+
+    async def top_matches(self, business_owner: Dict, limit: int):
+        """Same result as creator_columns.top_matches, computed by a worker"""
+        block, layout, ids, _ = await self.snapshot()
+        if len(ids) == 0 or limit <= 0:
+            return []
+        # Value dictionaries only grow, so current lookup tables cover every snapshot
+        prepared = creator_columns.match_query(business_owner)
+        if prepared is None:
+            return []
+        self.in_flight[block.name] += 1
+        try:
+            rows, scores, totals = await asyncio.get_running_loop().run_in_executor(
+                self.executor, match_worker.shared_top_matches, block.name, layout, *prepared, limit
+            )
+        finally:
+            self.in_flight[block.name] -= 1
+            self._release_idle()
+        return [(ids[row], int(score), int(total)) for row, score, total in zip(rows, scores, totals)]
+
+    def _release_idle(self):
+        """Unlink every snapshot but the newest once no request is using it"""
+        for snapshot in self.snapshots[:-1]:
+            if self.in_flight.get(snapshot[0].name, 0) == 0:
+                self.snapshots.remove(snapshot)
+                self._release(snapshot)
+
+    def _release(self, snapshot):
+        block = snapshot[0]
+        self.in_flight.pop(block.name, None)
+        block.close()
+        block.unlink()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        while self.snapshots:
+            self._release(self.snapshots.pop())
+
+match_pool = MatchPool(MATCH_POOL_WORKERS)
+
+# Semantic matching: hashed bag-of-words vectors with an IVF nearest-neighbour index
+SEMANTIC_DIMENSIONS = 128
+SEMANTIC_PROBES = 8  # clusters scanned per query
+SEMANTIC_CANDIDATES = 500  # nearest creators re-scored per query
+SEMANTIC_TRAINING_SAMPLE = 20000
+
+# Word-level synonyms on top of FACET_ALIASES so related vocabulary shares features
+SEMANTIC_ALIASES = {
+    **{alias: canonical for alias, canonical in FACET_ALIASES.items() if " " not in alias},
+    "clothes": "fashion",
+    "outfit": "fashion",
+    "outfits": "fashion",
+    "style": "fashion",
+    "cosmetics": "beauty",
+    "skincare": "beauty",
+    "gym": "fitness",
+    "workout": "fitness",
+    "yoga": "fitness",
+    "cooking": "food",
+    "recipe": "food",
+    "recipes": "food",
+    "restaurant": "food",
+    "foodie": "food",
+    "hotel": "travel",
+    "tourism": "travel",
+    "software": "tech",
+    "electronics": "tech",
+    "gaming": "tech"
+}
+SEMANTIC_STOPWORDS = {"a", "an", "and", "the", "of", "for", "in", "on", "to", "with", "my", "our", "we", "i", "is", "are", "at", "by", "from"}
+
+def embed_text(*texts) -> np.ndarray:
+    """Unit-length hashed vector of words (canonicalized) and their character trigrams"""
+    vector = np.zeros(SEMANTIC_DIMENSIONS, dtype=np.float32)
+    for text in texts:
+        for word in re.findall(r"[a-z0-9]+", (text or "").lower()):
+            if word in SEMANTIC_STOPWORDS:
+                continue
+            word = SEMANTIC_ALIASES.get(word, word)
+            padded = f"<{word}>"
+            features = [(word, 1.0)] + [(padded[i:i + 3], 0.3) for i in range(len(padded) - 2)]
+            for feature, weight in features:
+                # crc32 is stable across processes, unlike hash()
+                bucket = zlib.crc32(feature.encode())
+                vector[bucket % SEMANTIC_DIMENSIONS] += weight if bucket & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def creator_vector(creator: Dict) -> np.ndarray:
+    # Category counts twice: it is short and the strongest signal
+    return embed_text(creator.get("category"), creator.get("category"), creator.get("bio"))
+
+def business_vector(business_owner: Dict) -> np.ndarray:
+    return embed_text(
+        business_owner.get("industry"), business_owner.get("industry"),
+        business_owner.get("company_description"), business_owner.get("target_audience")
+    )
+
+def train_ivf(vectors: np.ndarray):
+    """k-means (spherical) centroids over a sample, and the nearest centroid of every vector"""
+    n = len(vectors)
+    clusters = max(1, min(1024, int(np.sqrt(n))))
+    rng = np.random.default_rng(0)
+    sample = vectors[rng.choice(n, min(n, SEMANTIC_TRAINING_SAMPLE), replace=False)].astype(np.float32)
+    centroids = sample[rng.choice(len(sample), clusters, replace=False)]
+    for _ in range(8):
+        nearest = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, nearest, sample)
+        norms = np.linalg.norm(sums, axis=1)
+        filled = norms > 0
+        centroids[filled] = sums[filled] / norms[filled, None]
+    assignments = np.concatenate([
+        np.argmax(vectors[i:i + 65536].astype(np.float32) @ centroids.T, axis=1)
+        for i in range(0, n, 65536)
+    ]).astype(np.int32)
+    return centroids, assignments
+
+class SemanticIndex:
+    """Text vectors of approved creators, searchable by cosine similarity.
+
+    Vectors are stored as float16 and grouped into inverted lists around k-means
+    centroids (IVF); a query scans only its SEMANTIC_PROBES nearest lists. Writes
+    join the nearest existing list; centroids are retrained in a thread once the
+    index has doubled since the last training (or on the first write if it
+    started empty).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.slots = {}
+        self.free_slots = []
+        self.size = 0
+        self.ready = False
+        self.training = False
+        self.trained_size = 0
+        self.changed_slots = set()
+        self.ids = np.empty(capacity, dtype=object)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.vectors = np.zeros((capacity, SEMANTIC_DIMENSIONS), dtype=np.float16)
+        self.assignments = np.zeros(capacity, dtype=np.int32)
+        self.centroids = np.zeros((0, SEMANTIC_DIMENSIONS), dtype=np.float32)
+
+    def _grow(self):
+        capacity = len(self.active) * 2
+        for name in ["ids", "active", "vectors", "assignments"]:
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def _assign(self, vector: np.ndarray) -> int:
+        return int(np.argmax(self.centroids @ vector)) if len(self.centroids) else 0
+
+    def upsert(self, creator_id: str, vector: np.ndarray):
+        slot = self.slots.get(creator_id)
+        if slot is None:
+            if self.free_slots:
+                slot = self.free_slots.pop()
+            else:
+                if self.size == len(self.active):
+                    self._grow()
+                slot = self.size
+                self.size += 1
+            self.slots[creator_id] = slot
+        self.ids[slot] = creator_id
+        self.active[slot] = True
+        self.vectors[slot] = vector
+        self.assignments[slot] = self._assign(vector)
+        if self.training:
+            self.changed_slots.add(slot)
+
+    def remove(self, creator_id: str):
+        slot = self.slots.pop(creator_id, None)
+        if slot is None:
+            return
+        self.active[slot] = False
+        self.ids[slot] = None
+        self.free_slots.append(slot)
+
+    def load(self, items):
+        """Replace all vectors with (creator_id, vector) pairs"""
+        fresh = SemanticIndex(max(1024, len(items)))
+        for creator_id, vector in items:
+            fresh.upsert(creator_id, vector)
+        self.__dict__.update(fresh.__dict__)
+
+    @property
+    def needs_training(self) -> bool:
+        return not self.training and self.size >= max(2 * self.trained_size, 1)
+
+    async def train(self):
+        """Retrain centroids off the event loop, then reassign rows written meanwhile"""
+        if self.training or self.size == 0:
+            return
+        self.training = True
+        self.changed_slots = set()
+        try:
+            n = self.size
+            centroids, assignments = await asyncio.get_running_loop().run_in_executor(
+                None, train_ivf, self.vectors[:n].copy()
+            )
+            self.centroids = centroids
+            self.assignments[:n] = assignments
+            for slot in self.changed_slots:
+                self.assignments[slot] = self._assign(self.vectors[slot].astype(np.float32))
+            self.trained_size = n
+            self.ready = True
+        finally:
+            self.training = False
+            self.changed_slots = set()
+
+    def search(self, vector: np.ndarray, k: int):
+        """Approximate k most similar creators as (creator_ids, similarities)"""
+        n = self.size
+        rows = np.flatnonzero(self.active[:n])
+        if len(self.centroids) > SEMANTIC_PROBES:
+            probed = np.argpartition(-(self.centroids @ vector), SEMANTIC_PROBES - 1)[:SEMANTIC_PROBES]
+            rows = np.flatnonzero(self.active[:n] & np.isin(self.assignments[:n], probed))
+        if len(rows) == 0:
+            return [], np.empty(0, dtype=np.float32)
+        similarities = self.vectors[rows].astype(np.float32) @ vector
+        if len(rows) > k:
+            top = np.argpartition(-similarities, k - 1)[:k]
+            rows, similarities = rows[top], similarities[top]
+        return list(self.ids[rows]), similarities
+
+semantic_index = SemanticIndex()
+
+async def train_semantic_index():
+    """Train semantic_index, dropping cached results computed by the vector fallback meanwhile"""
+    was_ready = semantic_index.ready
+    await semantic_index.train()
+    if semantic_index.ready and not was_ready:
+        match_cache.bump_directory()
+
+async def build_semantic_index():
+    """Embed approved creators into semantic_index and train it"""
+    log = open_write_log(creator_write_logs)
+    try:
+        items = []
+        cursor = db.creators.find({"profile_status": "approved"}, {"_id": 0, "id": 1, "category": 1, "bio": 1})
+        async for creator in cursor:
+            items.append((creator["id"], creator_vector(creator)))
+            if len(items) % 1000 == 0:
+                await asyncio.sleep(0)  # embedding is pure Python; let requests through
+        semantic_index.load(items)
+        for before, after in log:
+            sync_semantic_index(before, after)
+        close_write_log(creator_write_logs, log)
+        await train_semantic_index()
+    except Exception as e:
+        print(f"Error building semantic index: {str(e)}")
+        close_write_log(creator_write_logs, log)
+
+# Reverse matching: which business owners would a creator match
+class IntervalTree:
+    """Centered interval tree over closed (low, high, key) intervals.
+
+    Stabbing queries (all intervals containing x) cost O(log n + k).
+    """
+
+    def __init__(self, intervals):
+        self.left = self.right = None
+        self.by_low = self.by_high = []
+        self.center = None
+        if not intervals:
+            return
+        endpoints = sorted(value for low, high, _ in intervals for value in (low, high))
+        self.center = endpoints[len(endpoints) // 2]
+        overlapping, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                overlapping.append(interval)
+        self.by_low = sorted(overlapping, key=lambda interval: interval[0])
+        self.by_high = sorted(overlapping, key=lambda interval: interval[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def stab(self, x) -> List:
+        """Keys of all intervals with low <= x <= high"""
+        keys = []
+        node = self
+        while node is not None and node.center is not None:
+            if x < node.center:
+                for low, _, key in node.by_low:
+                    if low > x:
+                        break
+                    keys.append(key)
+                node = node.left
+            elif x > node.center:
+                for _, high, key in node.by_high:
+                    if high < x:
+                        break
+                    keys.append(key)
+                node = node.right
+            else:
+                keys += [key for _, _, key in node.by_low]
+                break
+        return keys
+
+class StabbingIndex:
+    """IntervalTree plus a small buffer of changes, rebuilt once the buffer outgrows sqrt(n)"""
+
+    def __init__(self):
+        self.intervals = {}
+        self.tree = IntervalTree([])
+        self.changed = set()
+
+    def load(self, intervals: Dict):
+        """Replace all intervals ({key: (low, high)}) with a single tree build"""
+        self.intervals = dict(intervals)
+        self.tree = IntervalTree([(low, high, key) for key, (low, high) in self.intervals.items()])
+        self.changed = set()
+
+    def upsert(self, key, low, high):
+        self.intervals[key] = (low, high)
+        self._changed(key)
+
+    def remove(self, key):
+        if self.intervals.pop(key, None) is not None:
+            self._changed(key)
+
+    def _changed(self, key):
+        self.changed.add(key)
+        if len(self.changed) > max(64, int(len(self.intervals) ** 0.5)):
+            self.tree = IntervalTree([(low, high, key) for key, (low, high) in self.intervals.items()])
+            self.changed = set()
+
+    def stab(self, x) -> List:
+        keys = [key for key in self.tree.stab(x) if key not in self.changed]
+        for key in self.changed:
+            interval = self.intervals.get(key)
+            if interval and interval[0] <= x <= interval[1]:
+                keys.append(key)
+        return keys
+
+# Business fields needed to score a creator against a business owner
+BUSINESS_MATCH_FIELDS = ["id", "industry", "location", "preferred_platforms", "min_followers", "max_followers", "profile_status"]
+
+class BusinessMatchIndex:
+    """Business owners bucketed by follower range (per platform set), industry and location"""
+
+    def __init__(self):
+        self.businesses = {}
+        self.ranges = {}
+        self.by_industry = {}
+        self.by_location = {}
+        self.ready = False
+
+    @staticmethod
+    def _entry(business: Dict):
+        """(entry, follower range) to index a business owner under, or None to leave it out"""
+        if business.get("profile_status") in ("rejected", "suspended"):
+            return None
+        set_key = platform_set_key(business.get("preferred_platforms"))
+        if not set_key:
+            return None
+        min_followers = business.get("min_followers") or 0
+        max_followers = business.get("max_followers")
+        max_followers = 1000000 if max_followers is None else max_followers
+        entry = (
+            {field: business.get(field) for field in BUSINESS_MATCH_FIELDS},
+            set_key, normalize_facet(business.get("industry")), normalize_facet(business.get("location"))
+        )
+        return entry, (min_followers, max_followers)
+
+    def _add(self, business_id: str, entry):
+        _, set_key, industry_norm, location_norm = entry
+        self.businesses[business_id] = entry
+        self.by_industry.setdefault(industry_norm, set()).add(business_id)
+        self.by_location.setdefault(location_norm, set()).add(business_id)
+
+    def upsert(self, business: Dict):
+        """Index a business owner (rejected and suspended ones are left out)"""
+        self.remove(business["id"])
+        indexed = self._entry(business)
+        if indexed is None:
+            return
+        entry, (min_followers, max_followers) = indexed
+        self._add(business["id"], entry)
+        self.ranges.setdefault(entry[1], StabbingIndex()).upsert(business["id"], min_followers, max_followers)
+
+    def remove(self, business_id: str):
+        entry = self.businesses.pop(business_id, None)
+        if entry is None:
+            return
+        _, set_key, industry_norm, location_norm = entry
+        self.ranges[set_key].remove(business_id)
+        self.by_industry[industry_norm].discard(business_id)
+        self.by_location[location_norm].discard(business_id)
+
+    def load(self, businesses):
+        """Replace all business owners, building each interval tree once"""
+        self.__init__()
+        intervals = {}
+        for business in businesses:
+            indexed = self._entry(business)
+            if indexed is None:
+                continue
+            entry, follower_range = indexed
+            self._add(business["id"], entry)
+            intervals.setdefault(entry[1], {})[business["id"]] = follower_range
+        for set_key, ranges in intervals.items():
+            self.ranges[set_key] = StabbingIndex()
+            self.ranges[set_key].load(ranges)
+        self.ready = True
+
+    @staticmethod
+    def _prefix_buckets(buckets: Dict, value: str) -> set:
+        """Union of buckets whose key is a prefix of value (the forward filter is a prefix match)"""
+        matched = set()
+        for end in range(len(value) + 1):
+            matched |= buckets.get(value[:end], set())
+        return matched
+
+    def candidates(self, creator: Dict):
+        """(business_id, total_followers) for every business whose requirements the creator meets"""
+        industry_ids = self._prefix_buckets(self.by_industry, normalize_facet(creator.get("category")))
+        location_ids = self._prefix_buckets(self.by_location, normalize_facet(creator.get("location")))
+        eligible = industry_ids & location_ids
+        if not eligible:
+            return []
+
+        sums = platform_sums(creator)
+        found = []
+        for set_key, index in self.ranges.items():
+            total_followers = sums[set_key]
+            found += [(business_id, total_followers) for business_id in index.stab(total_followers) if business_id in eligible]
+        return found
+
+    def matches(self, creator: Dict, limit: int):
+        """Top `limit` (business_id, match_score, total_followers) for a creator.
+
+        Only approved business owners are returned, as in get_business_owners; pending
+        ones stay indexed so creator writes still refresh their match tables.
+        """
+        scored = []
+        for business_id, total_followers in self.candidates(creator):
+            business = self.businesses[business_id][0]
+            if business.get("profile_status") != "approved":
+                continue
+            score = calculate_business_match_score(
+                {**creator, "category": creator.get("category") or "", "location": creator.get("location") or "",
+                 "total_followers": total_followers},
+                {**business, "industry": business.get("industry") or "", "location": business.get("location") or "",
+                 "min_followers": business.get("min_followers") or 0,
+                 "max_followers": 1000000 if business.get("max_followers") is None else business["max_followers"]}
+            )
+            scored.append((score, business_id, total_followers))
+        scored.sort(key=lambda match: (-match[0], match[1]))
+        return [(business_id, score, total_followers) for score, business_id, total_followers in scored[:limit]]
+
+business_match_index = BusinessMatchIndex()
+
+async def build_business_match_index():
+    """Load business owner requirements into business_match_index"""
+    log = open_write_log(business_write_logs)
+    try:
+        projection = {"_id": 0, **{field: 1 for field in BUSINESS_MATCH_FIELDS}}
+        businesses = await db.business_owners.find({}, projection).to_list(length=None)
+        business_match_index.load(businesses)
+        for before, after in log:
+            sync_business_match_index(before, after)
+    except Exception as e:
+        print(f"Error building business match index: {str(e)}")
+    finally:
+        close_write_log(business_write_logs, log)
+
+business_match_index_task = None
+
+def business_match_index_built():
+    """The shared build of business_match_index, started again only if the last one failed"""
+    global business_match_index_task
+    task = business_match_index_task
+    if task is None or (task.done() and not business_match_index.ready):
+        task = business_match_index_task = start_background_task(build_business_match_index())
+    return task
+
+# Match results served by match_creators_for_business, least recently used evicted first
+MATCH_CACHE_MAX_ENTRIES = 2048
+
+class MatchResultCache:
+    """Bounded LRU cache of match results.
+
+    Keys carry the directory version and the business owner's own version, so a
+    creator write (or a business edit) makes older entries unreachable instead of
+    requiring a scan; they simply age out. Business edits also drop their entries
+    right away to free the space.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.by_business = {}
+        self.business_versions = {}
+        self.directory_version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def key(self, business_id: str, *params):
+        return (business_id, self.business_versions.get(business_id, 0), self.directory_version) + params
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        self.by_business.setdefault(key[0], set()).add(key)
+        while len(self.entries) > self.max_entries:
+            evicted, _ = self.entries.popitem(last=False)
+            self._forget(evicted)
+            self.evictions += 1
+
+    def _forget(self, key):
+        keys = self.by_business.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.by_business[key[0]]
+
+    def bump_directory(self):
+        """Invalidate every entry after a creator write"""
+        self.directory_version += 1
+
+    def invalidate_business(self, business_id: str):
+        """Invalidate the entries of one business owner after it was edited"""
+        self.business_versions[business_id] = self.business_versions.get(business_id, 0) + 1
+        for key in self.by_business.pop(business_id, ()):
+            if self.entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "directory_version": self.directory_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+match_cache = MatchResultCache(MATCH_CACHE_MAX_ENTRIES)
+
+# Precomputed match tables: top matches per business owner in creator_matches
+MATCH_TABLE_SIZE = 50
+MATCH_TABLE_REBUILD_SECONDS = 3600
+MATCH_TABLE_BURST = 100  # dirty tables refreshed back to back while the queue is shorter than this
+MATCH_TABLE_PACE_SECONDS = 0.02  # pause between refreshes beyond the burst and during rebuilds
+
+match_table_dirty = set()
+match_table_backlog = set()  # periodic re-checks; their stored rows keep being served
+match_table_wakeup = asyncio.Event()
+
+def mark_match_tables_dirty(business_ids):
+    """Queue business owners whose stored matches must be recomputed"""
+    if business_ids:
+        match_table_dirty.update(business_ids)
+        match_table_wakeup.set()
+
+def schedule_match_table_rebuild():
+    """Queue every business owner for a paced re-check of its stored matches"""
+    match_table_backlog.update(business_match_index.businesses)
+    match_table_wakeup.set()
+
+def match_inputs_changed(before: Optional[Dict], after: Optional[Dict]) -> bool:
+    """Whether a creator write can change any business owner's matches"""
+    if before is None or after is None:
+        return True
+    return any(before.get(field) != after.get(field) for field in MATCH_SCORING_FIELDS + ["profile_status"])
+
+async def refresh_match_table(business_id: str):
+    """Recompute and store the top matches of one business owner"""
+    business = await db.business_owners.find_one({"id": business_id}, {"_id": 0})
+    if not business or business.get("profile_status") in ("rejected", "suspended"):
+        await db.creator_matches.delete_one({"business_owner_id": business_id})
+        return
+    # Score off the event loop; a business write or creator write that lands meanwhile re-queues it
+    if match_pool.ready:
+        matches = await match_pool.top_matches(business, MATCH_TABLE_SIZE)
+    else:
+        matches = await creator_columns.top_matches_in_thread(business, MATCH_TABLE_SIZE)
+    await db.creator_matches.update_one(
+        {"business_owner_id": business_id},
+        {"$set": {
+            "matches": [
+                {"creator_id": creator_id, "match_score": match_score, "total_followers": total_followers}
+                for creator_id, match_score, total_followers in matches
+            ],
+            "computed_at": datetime.now(timezone.utc).isoformat()
+        }},
+        upsert=True
+    )
+    # Results cached while the row was missing or stale came from another engine
+    match_cache.invalidate_business(business_id)
+
+async def match_table_worker():
+    """Drain the dirty queue, then the rebuild backlog, one business owner at a time.
+
+    Large queues and the backlog are paced so a full rebuild spreads its database
+    and scoring load instead of competing with requests in one burst.
+    """
+    while True:
+        await match_table_wakeup.wait()
+        match_table_wakeup.clear()
+        if not creator_columns.ready:
+            await asyncio.sleep(1)
+            match_table_wakeup.set()
+            continue
+        while match_table_dirty or match_table_backlog:
+            if match_table_dirty:
+                business_id = match_table_dirty.pop()
+                paced = len(match_table_dirty) >= MATCH_TABLE_BURST
+            else:
+                business_id = match_table_backlog.pop()
+                paced = True
+            match_table_backlog.discard(business_id)
+            try:
+                await refresh_match_table(business_id)
+            except Exception as e:
+                print(f"Error refreshing match table for {business_id}: {str(e)}")
+            await asyncio.sleep(MATCH_TABLE_PACE_SECONDS if paced else 0)
+
+async def match_table_rebuild_loop():
+    """Periodically recompute every table in case an incremental update was missed"""
+    while True:
+        if creator_columns.ready and business_match_index.ready:
+            schedule_match_table_rebuild()
+            await asyncio.sleep(MATCH_TABLE_REBUILD_SECONDS)
+        else:
+            await asyncio.sleep(5)
+
+# Writes seen while an index load is fetching, replayed once the loaded index is in place
+creator_write_logs = []
+business_write_logs = []
+
+def open_write_log(logs: List) -> List:
+    """Start recording (before, after) pairs of writes for a load"""
+    log = []
+    logs.append(log)
+    return log
+
+def close_write_log(logs: List, log: List):
+    logs[:] = [other for other in logs if other is not log]  # by identity: empty logs compare equal
+
+def record_write(logs: List, before: Optional[Dict], after: Optional[Dict]):
+    for log in logs:
+        log.append((before, after))
+
+def sync_business_match_index(before: Optional[Dict], after: Optional[Dict]):
+    if after is None:
+        business_match_index.remove(before["id"])
+    else:
+        business_match_index.upsert(after)
+
+async def on_business_written(before: Optional[Dict], after: Optional[Dict]):
+    """Keep in-memory business indexes in sync after a write"""
+    try:
+        record_write(business_write_logs, before, after)
+        sync_business_match_index(before, after)
+        mark_match_tables_dirty([(before or after)["id"]])
+        match_cache.invalidate_business((before or after)["id"])
+    except Exception as e:
+        print(f"Error syncing business indexes: {str(e)}")
+
+async def build_creator_columns():
+    """Load matching features of approved creators into creator_columns"""
+    log = open_write_log(creator_write_logs)
+    try:
+        projection = {"_id": 0, "id": 1, **{field: 1 for field in MATCH_SCORING_FIELDS}}
+        creators = await db.creators.find({"profile_status": "approved"}, projection).to_list(length=None)
+        creator_columns.load(creators)
+        for before, after in log:
+            sync_creator_columns(before, after)
+        # Results cached before the load came from the scan fallback
+        match_cache.bump_directory()
+    except Exception as e:
+        print(f"Error building creator columns: {str(e)}")
+    finally:
+        close_write_log(creator_write_logs, log)
+
+def sync_suggest_index(before: Optional[Dict], after: Optional[Dict]):
+    if after is None:
+        suggest_index.remove(before["id"])
+    elif before is None or before.get("name") != after.get("name") or suggestion_keys(before) != suggestion_keys(after):
+        suggest_index.add(after["id"], suggestion_keys(after), after.get("name", ""))
+
+def sync_creator_columns(before: Optional[Dict], after: Optional[Dict]):
+    if after is not None and after.get("profile_status") == "approved":
+        creator_columns.upsert(after)
+    else:
+        creator_columns.remove((before or after)["id"])
+
+def sync_semantic_index(before: Optional[Dict], after: Optional[Dict]):
+    if after is not None and after.get("profile_status") == "approved":
+        if before is None or any(before.get(field) != after.get(field) for field in ["profile_status", "category", "bio"]):
+            semantic_index.upsert(after["id"], creator_vector(after))
+    else:
+        semantic_index.remove((before or after)["id"])
+
+async def on_creator_written(before: Optional[Dict], after: Optional[Dict]):
+    """Keep platform counters and in-memory creator indexes in sync after a write.
+
+    `before` is None for new creators and `after` is None for deleted ones.
+    """
+    try:
+        await apply_creator_counter_delta(before, after)
+        invalidate_response_caches(*CREATOR_STATS_CACHES)
+    except Exception as e:
+        print(f"Error updating creator counters: {str(e)}")
+    
+    try:
+        match_cache.bump_directory()
+        
+        # Loads still fetching replay this write once they are in place
+        record_write(creator_write_logs, before, after)
+        sync_suggest_index(before, after)
+        sync_creator_columns(before, after)
+        sync_semantic_index(before, after)
+        # Also covers an index that started empty and has never been trained
+        if semantic_index.needs_training:
+            start_background_task(train_semantic_index())
+        
+        # Business owners this creator matched before or matches now need new tables
+        if match_inputs_changed(before, after):
+            affected = set()
+            for creator in (before, after):
+                if creator and creator.get("profile_status") == "approved":
+                    affected.update(business_id for business_id, _ in business_match_index.candidates(creator))
+            mark_match_tables_dirty(affected)
+        
+        # Any change to an approved packaged creator can reorder or restyle its showcase
+        for creator in (before, after):
+            if creator and creator.get("profile_status") == "approved":
+                schedule_tier_refresh(creator.get("highlight_package"))
+    except Exception as e:
+        print(f"Error syncing creator indexes: {str(e)}")
+
+async def update_creator_document(creator_id: str, fields: Dict):
+    """$set fields on a creator and run the write hooks; returns the updated document or None"""
+    before = await db.creators.find_one_and_update({"id": creator_id}, {"$set": fields})
+    if before is None:
+        return None
+    after = {**before, **fields}
+    await on_creator_written(before, after)
+    return after
+
+# Background tasks started with the application
+background_tasks = set()
+
+def start_background_task(coroutine):
+    """Run a coroutine in the background and keep a reference until it finishes"""
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+@app.on_event("startup")
+async def start_background_jobs():
+    """Kick off startup maintenance without delaying the first request"""
+    start_background_task(reconcile_indexes())
+    start_background_task(backfill_all_derived_fields())
+    start_background_task(build_suggest_index())
+    start_background_task(tier_showcase_loop())
+    start_background_task(build_creator_columns())
+    business_match_index_built()
+    start_background_task(build_semantic_index())
+    start_background_task(counter_repair_loop())
+    start_background_task(ensure_revenue_rollups())
+    start_background_task(creator_snapshot_loop())
+    start_background_task(match_table_worker())
+    start_background_task(match_table_rebuild_loop())
+    start_background_task(match_scoring_reload_loop())
+    if MATCH_POOL_WORKERS > 0:
+        match_pool.start()
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    """Cancel background jobs that are still running"""
+    for task in list(background_tasks):
+        task.cancel()
+    match_pool.shutdown()
+
 # API Routes
 
 @app.get("/")
@@ -321,29 +2146,56 @@ async def root():
 # Creator Profile Routes
 @app.get("/api/creators", response_model=List[Creator])
 async def get_creators(
+    response: Response,
     category: Optional[str] = None,
     location: Optional[str] = None,
     verified_only: Optional[bool] = False,
     package: Optional[str] = None,
     limit: Optional[int] = 20,
-    skip: Optional[int] = 0
+    skip: Optional[int] = 0,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = "newest",
+    fields: Optional[str] = None
 ):
-    """Get list of creators with optional filtering"""
+    """Get list of creators with optional filtering.
+
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next one;
+    `skip` is only kept for backward compatibility and ignored with a cursor.
+    `fields` (e.g. "card" or "id,name,category") returns only those fields.
+    """
     try:
+        sort_keys = CREATOR_SORTS.get(sort)
+        if not sort_keys:
+            raise HTTPException(status_code=400, detail=f"Invalid sort. Must be one of: {', '.join(CREATOR_SORTS)}")
+        projection, requested = creator_projection(fields, [field for field, _ in sort_keys])
+
         # Build filter query
         filter_query = {}
-        if category:
-            filter_query["category"] = {"$regex": category, "$options": "i"}
-        if location:
-            filter_query["location"] = {"$regex": location, "$options": "i"}
+        if prefix_match(category):
+            filter_query["category_norm"] = prefix_match(category)
+        if prefix_match(location):
+            filter_query["location_norm"] = prefix_match(location)
         if verified_only:
             filter_query["verification_status"] = True
         if package:
             filter_query["highlight_package"] = package
 
         # Get creators from database
-        cursor = db.creators.find(filter_query).skip(skip).limit(limit)
-        creators = await cursor.to_list(length=limit)
+        if cursor:
+            db_cursor = db.creators.find(apply_cursor(filter_query, cursor, sort_keys, sort), projection)
+        else:
+            db_cursor = db.creators.find(filter_query, projection).skip(skip)
+        creators = await db_cursor.sort(sort_keys).limit(limit).to_list(length=limit)
+        
+        page_cursor = next_cursor(creators, limit, sort_keys, sort)
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
+        
+        if requested:
+            return JSONResponse(
+                content=jsonable_encoder([sparse_document(c, requested) for c in creators]),
+                headers={"X-Next-Cursor": page_cursor} if page_cursor else None
+            )
         
         # Parse each creator
         parsed_creators = []
@@ -353,17 +2205,23 @@ async def get_creators(
                 parsed_creators.append(Creator(**parsed_creator))
         
         return parsed_creators
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching creators: {str(e)}")
 
 @app.get("/api/creators/{creator_id}", response_model=Creator)
-async def get_creator(creator_id: str):
-    """Get specific creator by ID"""
+async def get_creator(creator_id: str, fields: Optional[str] = None):
+    """Get specific creator by ID (optionally only the given `fields`)"""
     try:
-        creator = await db.creators.find_one({"id": creator_id})
+        projection, requested = creator_projection(fields)
+        creator = await db.creators.find_one({"id": creator_id}, projection)
         if not creator:
             raise HTTPException(status_code=404, detail="Creator not found")
         
+        if requested:
+            return JSONResponse(content=jsonable_encoder(sparse_document(creator, requested)))
+        
         parsed_creator = parse_from_mongo(creator)
         return Creator(**parsed_creator)
     except HTTPException:
@@ -371,6 +2229,39 @@ async def get_creator(creator_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching creator: {str(e)}")
 
+BATCH_GET_MAX_IDS = 500
+
+@app.post("/api/creators/batch-get")
+async def batch_get_creators(request: CreatorBatchGetRequest):
+    """Get many creators by ID in one query, in the order the IDs were given"""
+    try:
+        if len(request.ids) > BATCH_GET_MAX_IDS:
+            raise HTTPException(status_code=400, detail=f"Too many ids. Maximum is {BATCH_GET_MAX_IDS}")
+        
+        projection, requested = creator_projection(request.fields)
+        unique_ids = list(dict.fromkeys(request.ids))
+        cursor = db.creators.find({"id": {"$in": unique_ids}}, projection)
+        found = {creator["id"]: creator async for creator in cursor}
+        
+        creators = []
+        for creator_id in request.ids:
+            creator = found.get(creator_id)
+            if not creator:
+                continue
+            if requested:
+                creators.append(sparse_document(creator, requested))
+            else:
+                creators.append(Creator(**parse_from_mongo(dict(creator))))
+        
+        return {
+            "creators": creators,
+            "missing": [creator_id for creator_id in unique_ids if creator_id not in found]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching creators: {str(e)}")
+
 @app.post("/api/creators", response_model=Creator)
 async def create_creator(creator_data: CreatorCreate):
     """Create new creator profile"""
@@ -384,9 +2275,11 @@ async def create_creator(creator_data: CreatorCreate):
         creator = Creator(**creator_data.dict())
         creator_dict = creator.dict()
         creator_dict = prepare_for_mongo(creator_dict)
+        creator_dict.update(derive_creator_fields(creator_dict))
         
         # Insert into database
         await db.creators.insert_one(creator_dict)
+        await on_creator_written(None, creator_dict)
         
         return creator
     except HTTPException:
@@ -405,17 +2298,17 @@ async def update_creator(creator_id: str, update_data: CreatorUpdate):
         
         # Prepare update data
         update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+        updated_creator = existing_creator
         if update_dict:
             update_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+            update_dict.update(derive_creator_fields({**existing_creator, **update_dict}))
             
             # Update in database
-            await db.creators.update_one(
-                {"id": creator_id},
-                {"$set": update_dict}
-            )
+            updated_creator = await update_creator_document(creator_id, update_dict)
+            if not updated_creator:
+                raise HTTPException(status_code=404, detail="Creator not found")
         
         # Return updated creator
-        updated_creator = await db.creators.find_one({"id": creator_id})
         parsed_creator = parse_from_mongo(updated_creator)
         return Creator(**parsed_creator)
     except HTTPException:
@@ -427,10 +2320,11 @@ async def update_creator(creator_id: str, update_data: CreatorUpdate):
 async def delete_creator(creator_id: str):
     """Delete creator profile"""
     try:
-        result = await db.creators.delete_one({"id": creator_id})
-        if result.deleted_count == 0:
+        deleted_creator = await db.creators.find_one_and_delete({"id": creator_id})
+        if not deleted_creator:
             raise HTTPException(status_code=404, detail="Creator not found")
         
+        await on_creator_written(deleted_creator, None)
         return {"message": "Creator deleted successfully"}
     except HTTPException:
         raise
@@ -439,6 +2333,7 @@ async def delete_creator(creator_id: str):
 
 # Highlight Package Routes
 @app.get("/api/packages", response_model=List[HighlightPackage])
+@cached_response("packages", ttl=3600, maxsize=1, stale_ttl=86400)
 async def get_packages():
     """Get all highlight packages"""
     try:
@@ -485,13 +2380,10 @@ async def upgrade_creator_package(creator_id: str, package_id: str):
             )
         
         # Update creator's package
-        await db.creators.update_one(
-            {"id": creator_id},
-            {"$set": {
-                "highlight_package": package_id,
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }}
-        )
+        await update_creator_document(creator_id, {
+            "highlight_package": package_id,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        })
         
         return {
             "message": f"Creator upgraded to {package['name']} successfully",
@@ -505,18 +2397,28 @@ async def upgrade_creator_package(creator_id: str, package_id: str):
         raise HTTPException(status_code=500, detail=f"Error upgrading package: {str(e)}")
 
 @app.get("/api/creators/by-package/{package_id}")
-async def get_creators_by_package(package_id: str, limit: Optional[int] = 10):
-    """Get creators by highlight package for homepage showcase"""
+async def get_creators_by_package(package_id: str, limit: Optional[int] = 10, fields: Optional[str] = None):
+    """Get creators by highlight package for homepage showcase (served from memory when warm)"""
     try:
-        if package_id not in ["silver", "gold", "platinum"]:
+        if package_id not in TIER_PACKAGES:
             raise HTTPException(status_code=400, detail="Invalid package type")
         
+        projection, requested = creator_projection(fields)
+        showcase = tier_showcases.get(package_id)
+        if showcase is not None and limit <= TIER_SHOWCASE_SIZE:
+            creators = showcase["creators"][:limit]
+            if requested:
+                return [sparse_document(c, requested) for c in creators]
+            return [Creator(**parse_from_mongo(dict(c))) for c in creators]
+        
         cursor = db.creators.find({
             "highlight_package": package_id,
             "profile_status": "approved"
-        }).limit(limit).sort("instagram_followers", -1)  # Sort by follower count
+        }, projection).limit(limit).sort("instagram_followers", -1)  # Sort by follower count
         
         creators = await cursor.to_list(length=limit)
+        if requested:
+            return [sparse_document(c, requested) for c in creators]
         
         parsed_creators = []
         for creator in creators:
@@ -531,6 +2433,76 @@ async def get_creators_by_package(package_id: str, limit: Optional[int] = 10):
         raise HTTPException(status_code=500, detail=f"Error fetching creators by package: {str(e)}")
 
 # Search and Discovery Routes
+# Facet counts returned by /api/search/creators?facets=true (name -> grouped field)
+SEARCH_FACETS = {
+    "category": "category_norm",
+    "location": "location_norm",
+    "highlight_package": "highlight_package",
+    "verification_status": "verification_status"
+}
+FACET_BUCKET_LIMIT = 20
+FACET_CACHE_TTL_SECONDS = 30
+FACET_CACHE_MAX_ENTRIES = 512
+
+# Facet counts keyed by search filters
+facet_cache = TTLCache("search_facets", FACET_CACHE_TTL_SECONDS, FACET_CACHE_MAX_ENTRIES)
+
+def get_cached_facets(key: str):
+    """Return cached facet counts for a filter combination if still fresh"""
+    return facet_cache.get(key)
+
+def cache_facets(key: str, counts: Dict):
+    """Store facet counts, evicting the least recently used entry when the cache is full"""
+    facet_cache.put(key, counts)
+
+def regex_search_clause(q: str):
+    """Unindexed text match used until the text index exists"""
+    return {"$or": [
+        {"name": {"$regex": q, "$options": "i"}},
+        {"bio": {"$regex": q, "$options": "i"}},
+        {"category": {"$regex": q, "$options": "i"}}
+    ]}
+
+async def run_creator_search(match_query, text: bool, projection, limit: int, with_facets: bool = False):
+    """Fetch one page of search results, plus facet counts in the same round trip if asked.
+
+    Returns (creators, facets) where facets is None unless with_facets is set.
+    """
+    if not with_facets:
+        if text:
+            cursor = db.creators.find(
+                match_query, {**(projection or {}), "relevance": {"$meta": "textScore"}}
+            ).sort([("relevance", {"$meta": "textScore"})]).limit(limit)
+        else:
+            cursor = db.creators.find(match_query, projection).limit(limit)
+        return await cursor.to_list(length=limit), None
+
+    pipeline = [{"$match": match_query}]
+    results_stages = []
+    if text:
+        pipeline.append({"$addFields": {"relevance": {"$meta": "textScore"}}})
+        results_stages.append({"$sort": {"relevance": -1}})
+    results_stages.append({"$limit": limit})
+    if projection:
+        results_stages.append({"$project": {**projection, **({"relevance": 1} if text else {})}})
+
+    facet_stages = {"results": results_stages, "total": [{"$count": "count"}]}
+    for name, field in SEARCH_FACETS.items():
+        facet_stages[name] = [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": FACET_BUCKET_LIMIT}
+        ]
+    pipeline.append({"$facet": facet_stages})
+
+    output = (await db.creators.aggregate(pipeline).to_list(length=1))[0]
+    facets = {
+        name: [{"value": bucket["_id"], "count": bucket["count"]} for bucket in output[name]]
+        for name in SEARCH_FACETS
+    }
+    facets["total"] = output["total"][0]["count"] if output["total"] else 0
+    return output["results"], facets
+
 @app.get("/api/search/creators")
 async def search_creators(
     q: Optional[str] = None,
@@ -538,55 +2510,106 @@ async def search_creators(
     location: Optional[str] = None,
     min_followers: Optional[int] = None,
     max_followers: Optional[int] = None,
-    limit: Optional[int] = 20
+    platform: Optional[str] = "max",
+    limit: Optional[int] = 20,
+    fields: Optional[str] = None,
+    facets: Optional[bool] = False
 ):
-    """Search creators with advanced filters"""
+    """Search creators with advanced filters, ranked by text relevance when q is given.
+
+    The follower range applies to `platform`: one of instagram, youtube, twitter,
+    tiktok, snapchat, "max" (largest single platform) or "total" (sum of all).
+    With `facets=true` the response also carries counts per category, location,
+    highlight_package and verification_status, computed in the same aggregation.
+    """
     try:
+        started = time.perf_counter()
+        projection, requested = creator_projection(fields)
+        follower_field = FOLLOWER_RANGE_FIELDS.get(platform)
+        if not follower_field:
+            raise HTTPException(status_code=400, detail=f"Invalid platform. Must be one of: {', '.join(FOLLOWER_RANGE_FIELDS)}")
         filter_query = {}
         
-        # Text search
-        if q:
-            filter_query["$or"] = [
-                {"name": {"$regex": q, "$options": "i"}},
-                {"bio": {"$regex": q, "$options": "i"}},
-                {"category": {"$regex": q, "$options": "i"}}
-            ]
-        
         # Category filter
-        if category:
-            filter_query["category"] = {"$regex": category, "$options": "i"}
+        if prefix_match(category):
+            filter_query["category_norm"] = prefix_match(category)
             
         # Location filter
-        if location:
-            filter_query["location"] = {"$regex": location, "$options": "i"}
+        if prefix_match(location):
+            filter_query["location_norm"] = prefix_match(location)
             
         # Follower count filters
         follower_filter = {}
-        if min_followers:
+        if min_followers is not None:
             follower_filter["$gte"] = min_followers
-        if max_followers:
+        if max_followers is not None:
             follower_filter["$lte"] = max_followers
         if follower_filter:
-            filter_query["$or"] = [
-                {"instagram_followers": follower_filter},
-                {"youtube_subscribers": follower_filter}
-            ]
+            filter_query[follower_field] = follower_filter
         
-        # Execute search
-        cursor = db.creators.find(filter_query).limit(limit)
-        creators = await cursor.to_list(length=limit)
+        # Facet counts change slowly, so they are reused for a short while
+        facet_key = json.dumps({"q": q, "filter": filter_query}, sort_keys=True, default=str)
+        facet_counts = get_cached_facets(facet_key) if facets else None
+        with_facets = bool(facets) and facet_counts is None
+        
+        # Text search uses the creators_text_search index; every word of q is a
+        # search term and documents matching more (and heavier) terms rank first
+        engine = "text" if q else "filter"
+        try:
+            match_query = {**filter_query, "$text": {"$search": q}} if q else filter_query
+            creators, computed_facets = await run_creator_search(match_query, bool(q), projection, limit, with_facets)
+        except OperationFailure:
+            if not q:
+                raise
+            # Text index not built yet (e.g. right after startup): fall back to regex scan
+            engine = "regex"
+            match_query = {"$and": [filter_query, regex_search_clause(q)]}
+            creators, computed_facets = await run_creator_search(match_query, False, projection, limit, with_facets)
+        
+        if computed_facets is not None:
+            cache_facets(facet_key, computed_facets)
+            facet_counts = computed_facets
         
         # Parse results
         parsed_creators = []
         for creator in creators:
+            if requested:
+                parsed_creators.append(sparse_document(creator, requested, ["relevance"]))
+                continue
             parsed_creator = parse_from_mongo(creator)
             if parsed_creator:
-                parsed_creators.append(Creator(**parsed_creator))
+                parsed_creators.append(CreatorSearchResult(**parsed_creator))
         
-        return {"results": parsed_creators, "count": len(parsed_creators)}
+        result = {
+            "results": parsed_creators,
+            "count": len(parsed_creators),
+            "engine": engine
+        }
+        if facets:
+            result["facets"] = facet_counts
+            result["facets_cached"] = not with_facets
+        result["took_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching creators: {str(e)}")
 
+@app.get("/api/search/suggest")
+async def suggest_creators(prefix: str = "", limit: Optional[int] = 10):
+    """Typeahead over creator names and social handles, answered from memory"""
+    try:
+        started = time.perf_counter()
+        key = normalize_suggest_key(prefix)
+        suggestions = suggest_index.search(key, max(1, min(limit, 50))) if key else []
+        return {
+            "suggestions": suggestions,
+            "ready": suggest_index.ready,
+            "took_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching suggestions: {str(e)}")
+
 # Payment Routes
 @app.post("/api/payments/create-order", response_model=PaymentOrderResponse)
 async def create_payment_order(request: PaymentOrderRequest):
@@ -686,19 +2709,28 @@ async def verify_payment(verification: PaymentVerificationRequest):
         if not transaction:
             raise HTTPException(status_code=404, detail="Payment transaction not found")
         
-        # Update payment status
-        await db.payment_transactions.update_one(
-            {"order_id": verification.order_id},
+        # Update payment status; the status guard makes completion happen once
+        completed_at = datetime.now(timezone.utc).isoformat()
+        completed = await db.payment_transactions.find_one_and_update(
+            {"order_id": verification.order_id, "status": {"$ne": "completed"}},
             {"$set": {
                 "payment_id": verification.payment_id,
                 "status": "completed",
                 "payment_status": "captured",
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "completed_at": completed_at,
+                "updated_at": completed_at
             }}
         )
+        if not completed:
+            return {"status": "success", "message": "Payment already verified"}
         
         # Process the payment based on type
         await process_payment_success(transaction, verification.payment_id)
+        try:
+            await record_revenue(completed, completed_at)
+            invalidate_response_caches("analytics_dashboard")
+        except Exception as e:
+            print(f"Error recording revenue rollup: {str(e)}")
         
         return {"status": "success", "message": "Payment verified successfully"}
         
@@ -725,26 +2757,20 @@ async def process_payment_success(transaction: Dict, payment_id: str):
             # Update creator verification status
             creator_id = metadata.get("creator_id")
             if creator_id:
-                await db.creators.update_one(
-                    {"id": creator_id},
-                    {"$set": {
-                        "verification_status": True,
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }}
-                )
+                await update_creator_document(creator_id, {
+                    "verification_status": True,
+                    "updated_at": datetime.now(timezone.utc).isoformat()
+                })
                 
         elif payment_type == "highlight_package":
             # Update creator highlight package
             creator_id = metadata.get("creator_id")
             package_id = metadata.get("package_id")
             if creator_id and package_id:
-                await db.creators.update_one(
-                    {"id": creator_id},
-                    {"$set": {
-                        "highlight_package": package_id,
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }}
-                )
+                await update_creator_document(creator_id, {
+                    "highlight_package": package_id,
+                    "updated_at": datetime.now(timezone.utc).isoformat()
+                })
                 
     except Exception as e:
         print(f"Error processing payment success: {str(e)}")
@@ -766,6 +2792,7 @@ async def get_transaction_status(order_id: str):
         raise HTTPException(status_code=500, detail=f"Error fetching transaction: {str(e)}")
 
 @app.get("/api/payments/pricing")
+@cached_response("payment_pricing", ttl=3600, maxsize=1, stale_ttl=86400)
 async def get_payment_pricing():
     """Get payment pricing information"""
     try:
@@ -799,23 +2826,135 @@ async def get_payment_pricing():
         raise HTTPException(status_code=500, detail=f"Error fetching pricing: {str(e)}")
 
 # Stats and Analytics Routes
+CREATOR_STATUSES = ["pending", "approved", "rejected", "suspended"]
+
+async def aggregate_creator_counts() -> Dict:
+    """Creator counts for the stats endpoints, computed in a single pass over the collection"""
+    def count_if(condition):
+        return {"$sum": {"$cond": [condition, 1, 0]}}
+    
+    pipeline = [{"$group": {
+        "_id": None,
+        "total": {"$sum": 1},
+        "verified": count_if({"$eq": ["$verification_status", True]}),
+        "premium": count_if({"$ne": [{"$ifNull": ["$highlight_package", None]}, None]}),
+        **{package: count_if({"$eq": ["$highlight_package", package]}) for package in TIER_PACKAGES},
+        **{status: count_if({"$eq": ["$profile_status", status]}) for status in CREATOR_STATUSES}
+    }}]
+    counts = await db.creators.aggregate(pipeline).to_list(length=1)
+    if not counts:
+        return {key: 0 for key in ["total", "verified", "premium"] + TIER_PACKAGES + CREATOR_STATUSES}
+    return counts[0]
+
+# Materialized creator counts in platform_counters, kept current by on_creator_written
+CREATOR_COUNTERS_ID = "creators"
+COUNTER_REPAIR_SECONDS = 3600
+
+def creator_counter_keys(creator: Optional[Dict]) -> set:
+    """Counters a creator document adds 1 to (same rules as aggregate_creator_counts)"""
+    if creator is None:
+        return set()
+    keys = {"total"}
+    if creator.get("verification_status") is True:
+        keys.add("verified")
+    package = creator.get("highlight_package")
+    if package is not None:
+        keys.add("premium")
+    if package in TIER_PACKAGES:
+        keys.add(package)
+    if creator.get("profile_status") in CREATOR_STATUSES:
+        keys.add(creator["profile_status"])
+    return keys
+
+async def apply_creator_counter_delta(before: Optional[Dict], after: Optional[Dict]):
+    """$inc the counters that changed between two versions of a creator"""
+    before_keys = creator_counter_keys(before)
+    after_keys = creator_counter_keys(after)
+    delta = {key: 1 for key in after_keys - before_keys}
+    delta.update({key: -1 for key in before_keys - after_keys})
+    if delta:
+        # No upsert: until the first repair creates the document there is nothing to adjust
+        await db.platform_counters.update_one(
+            {"_id": CREATOR_COUNTERS_ID},
+            {"$inc": delta, "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}}
+        )
+
+async def repair_creator_counters(apply: bool = True) -> Dict:
+    """Recount creators from scratch and report how far the stored counters had drifted"""
+    actual = await aggregate_creator_counts()
+    actual.pop("_id", None)
+    stored = await db.platform_counters.find_one({"_id": CREATOR_COUNTERS_ID})
+    drift = {}
+    for key, value in actual.items():
+        stored_value = (stored or {}).get(key, 0)
+        if value != stored_value:
+            drift[key] = value - stored_value
+    if apply:
+        now = datetime.now(timezone.utc).isoformat()
+        await db.platform_counters.update_one(
+            {"_id": CREATOR_COUNTERS_ID},
+            {"$set": {**actual, "updated_at": now, "repaired_at": now}},
+            upsert=True
+        )
+        if drift:
+            invalidate_response_caches(*CREATOR_STATS_CACHES)
+    return {"counters": actual, "drift": drift, "initialized": stored is None, "applied": apply}
+
+async def read_creator_counters() -> Dict:
+    """Current creator counters, created on first use"""
+    counters = await db.platform_counters.find_one({"_id": CREATOR_COUNTERS_ID})
+    if counters is None:
+        return (await repair_creator_counters())["counters"]
+    return counters
+
+async def correct_creator_counters(drift: Dict):
+    """$inc counters by a measured drift, leaving concurrent increments intact"""
+    now = datetime.now(timezone.utc).isoformat()
+    await db.platform_counters.update_one(
+        {"_id": CREATOR_COUNTERS_ID},
+        {"$inc": drift, "$set": {"updated_at": now, "repaired_at": now}}
+    )
+    invalidate_response_caches(*CREATOR_STATS_CACHES)
+
+async def counter_repair_loop():
+    """Periodically recount so missed or failed increments do not accumulate.
+
+    A recount races with $inc from concurrent writes, so a single check only
+    reports drift; it is corrected once the same drift shows up twice in a row.
+    """
+    previous_drift = None
+    while True:
+        try:
+            report = await repair_creator_counters(apply=False)
+            if report["initialized"]:
+                await repair_creator_counters()
+                previous_drift = None
+            elif report["drift"] and report["drift"] == previous_drift:
+                await correct_creator_counters(report["drift"])
+                print(f"Corrected creator counter drift: {report['drift']}")
+                previous_drift = None
+            else:
+                if report["drift"]:
+                    print(f"Creator counter drift detected, rechecking: {report['drift']}")
+                previous_drift = report["drift"] or None
+        except Exception as e:
+            print(f"Error checking creator counters: {str(e)}")
+        await asyncio.sleep(COUNTER_REPAIR_SECONDS)
+
 @app.get("/api/stats")
+@cached_response("platform_stats", ttl=30, maxsize=1, stale_ttl=300)
 async def get_platform_stats():
     """Get platform statistics"""
     try:
-        total_creators = await db.creators.count_documents({})
-        verified_creators = await db.creators.count_documents({"verification_status": True})
-        silver_users = await db.creators.count_documents({"highlight_package": "silver"})
-        gold_users = await db.creators.count_documents({"highlight_package": "gold"})
-        platinum_users = await db.creators.count_documents({"highlight_package": "platinum"})
+        counts = await read_creator_counters()
         
         return {
-            "total_creators": total_creators,
-            "verified_creators": verified_creators,
+            "total_creators": counts["total"],
+            "verified_creators": counts["verified"],
             "highlight_packages": {
-                "silver": silver_users,
-                "gold": gold_users,
-                "platinum": platinum_users
+                "silver": counts["silver"],
+                "gold": counts["gold"],
+                "platinum": counts["platinum"]
             }
         }
     except Exception as e:
@@ -847,10 +2986,7 @@ async def approve_creator(creator_id: str, action: AdminAction):
         elif action.action == "activate":
             update_data["profile_status"] = "approved"
         
-        await db.creators.update_one(
-            {"id": creator_id},
-            {"$set": update_data}
-        )
+        await update_creator_document(creator_id, update_data)
         
         return {"message": f"Creator {action.action}d successfully", "status": action.action}
     except HTTPException:
@@ -876,21 +3012,18 @@ async def get_pending_creators():
         raise HTTPException(status_code=500, detail=f"Error fetching pending creators: {str(e)}")
 
 @app.get("/api/admin/users/stats")
+@cached_response("user_management_stats", ttl=30, maxsize=1, stale_ttl=300)
 async def get_user_management_stats():
     """Get user management statistics"""
     try:
-        total_creators = await db.creators.count_documents({})
-        pending_approval = await db.creators.count_documents({"profile_status": "pending"})
-        approved_creators = await db.creators.count_documents({"profile_status": "approved"})
-        rejected_creators = await db.creators.count_documents({"profile_status": "rejected"})
-        suspended_creators = await db.creators.count_documents({"profile_status": "suspended"})
+        counts = await read_creator_counters()
         
         return {
-            "total_creators": total_creators,
-            "pending_approval": pending_approval,
-            "approved_creators": approved_creators,
-            "rejected_creators": rejected_creators,
-            "suspended_creators": suspended_creators
+            "total_creators": counts["total"],
+            "pending_approval": counts["pending"],
+            "approved_creators": counts["approved"],
+            "rejected_creators": counts["rejected"],
+            "suspended_creators": counts["suspended"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching user stats: {str(e)}")
@@ -900,16 +3033,21 @@ async def get_user_management_stats():
 async def get_all_transactions(
     limit: Optional[int] = 50,
     skip: Optional[int] = 0,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """Get all payment transactions"""
+    """Get all payment transactions, newest first (pass next_cursor back as cursor for the next page)"""
     try:
         filter_query = {}
         if status:
             filter_query["status"] = status
         
-        cursor = db.payment_transactions.find(filter_query).skip(skip).limit(limit).sort("created_at", -1)
-        transactions = await cursor.to_list(length=limit)
+        if cursor:
+            db_cursor = db.payment_transactions.find(apply_cursor(filter_query, cursor, NEWEST_FIRST))
+        else:
+            db_cursor = db.payment_transactions.find(filter_query).skip(skip)
+        transactions = await db_cursor.sort(NEWEST_FIRST).limit(limit).to_list(length=limit)
+        page_cursor = next_cursor(transactions, limit, NEWEST_FIRST)
         
         parsed_transactions = []
         for transaction in transactions:
@@ -922,45 +3060,218 @@ async def get_all_transactions(
         return {
             "transactions": parsed_transactions,
             "total": total_transactions,
-            "page": skip // limit + 1 if limit > 0 else 1
+            "page": skip // limit + 1 if limit > 0 else 1,
+            "next_cursor": page_cursor
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching transactions: {str(e)}")
 
+def created_at_range(start: Optional[datetime], end: Optional[datetime]) -> Optional[Dict]:
+    """created_at filter for [start, end); naive datetimes are taken as UTC"""
+    bounds = {}
+    for operator, value in (("$gte", start), ("$lt", end)):
+        if value is not None:
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            # created_at is stored as a UTC ISO string, which sorts chronologically
+            bounds[operator] = value.astimezone(timezone.utc).isoformat()
+    return bounds or None
+
+async def aggregate_revenue(created_at: Optional[Dict] = None) -> Dict:
+    """Completed payments per payment_type: {type: {"amount": paise, "count": n}}"""
+    match = {"status": "completed"}
+    if created_at:
+        match["created_at"] = created_at
+    pipeline = [
+        {"$match": match},
+        {"$group": {"_id": "$payment_type", "amount": {"$sum": {"$ifNull": ["$amount", 0]}}, "count": {"$sum": 1}}}
+    ]
+    return {row["_id"]: row async for row in db.payment_transactions.aggregate(pipeline)}
+
+# Revenue rollups: completed payment totals per day and month, payment type and package.
+# Documents are keyed "granularity|period|payment_type|package_id" and hold amount (paise) and count.
+REVENUE_GRANULARITIES = {"day": 10, "month": 7}  # length of the period prefix of an ISO timestamp
+REVENUE_TIMESERIES_MAX_POINTS = 3660
+
+def revenue_rollup_id(granularity: str, period: str, payment_type: Optional[str], package_id: Optional[str]) -> str:
+    return f"{granularity}|{period}|{payment_type or ''}|{package_id or ''}"
+
+async def record_revenue(transaction: Dict, completed_at: str):
+    """Add one completed payment to its day and month buckets"""
+    payment_type = transaction.get("payment_type")
+    package_id = (transaction.get("metadata") or {}).get("package_id")
+    operations = []
+    for granularity, length in REVENUE_GRANULARITIES.items():
+        period = completed_at[:length]
+        operations.append(UpdateOne(
+            {"_id": revenue_rollup_id(granularity, period, payment_type, package_id)},
+            {
+                "$inc": {"amount": transaction.get("amount") or 0, "count": 1},
+                "$setOnInsert": {"granularity": granularity, "period": period,
+                                 "payment_type": payment_type, "package_id": package_id}
+            },
+            upsert=True
+        ))
+    await db.revenue_rollups.bulk_write(operations, ordered=False)
+
+async def rebuild_revenue_rollups() -> Dict:
+    """Recompute every bucket from payment_transactions.
+
+    Payments completed while the rebuild runs may be missed or counted twice;
+    run it again if it overlapped with checkout traffic.
+    """
+    pipeline = [
+        {"$match": {"status": "completed"}},
+        {"$group": {
+            "_id": {
+                # Payments completed before completed_at existed fall back to their last update
+                "day": {"$substrBytes": [{"$ifNull": ["$completed_at", {"$ifNull": ["$updated_at", "$created_at"]}]}, 0, 10]},
+                "payment_type": "$payment_type",
+                "package_id": {"$ifNull": ["$metadata.package_id", None]}
+            },
+            "amount": {"$sum": {"$ifNull": ["$amount", 0]}},
+            "count": {"$sum": 1}
+        }}
+    ]
+    buckets = {}
+    async for row in db.payment_transactions.aggregate(pipeline):
+        key = row["_id"]
+        for granularity, length in REVENUE_GRANULARITIES.items():
+            period = key["day"][:length]
+            rollup_id = revenue_rollup_id(granularity, period, key["payment_type"], key["package_id"])
+            bucket = buckets.setdefault(rollup_id, {
+                "_id": rollup_id, "granularity": granularity, "period": period,
+                "payment_type": key["payment_type"], "package_id": key["package_id"], "amount": 0, "count": 0
+            })
+            bucket["amount"] += row["amount"]
+            bucket["count"] += row["count"]
+    
+    rebuilt_at = datetime.now(timezone.utc).isoformat()
+    operations = [
+        UpdateOne({"_id": rollup_id}, {"$set": {**bucket, "rebuilt_at": rebuilt_at}}, upsert=True)
+        for rollup_id, bucket in buckets.items()
+    ]
+    for start in range(0, len(operations), 1000):
+        await db.revenue_rollups.bulk_write(operations[start:start + 1000], ordered=False)
+    removed = await db.revenue_rollups.delete_many({"rebuilt_at": {"$ne": rebuilt_at}})
+    invalidate_response_caches("analytics_dashboard")
+    return {"buckets": len(buckets), "removed": removed.deleted_count, "rebuilt_at": rebuilt_at}
+
+async def ensure_revenue_rollups():
+    """Backfill rollups on first start after they were introduced"""
+    try:
+        if not await db.revenue_rollups.find_one({}) and await db.payment_transactions.find_one({"status": "completed"}):
+            await rebuild_revenue_rollups()
+    except Exception as e:
+        print(f"Error backfilling revenue rollups: {str(e)}")
+
+async def current_month_revenue() -> int:
+    """Completed payments this calendar month (UTC), in paise"""
+    month = datetime.now(timezone.utc).isoformat()[:REVENUE_GRANULARITIES["month"]]
+    rows = await db.revenue_rollups.find({"granularity": "month", "period": month}, {"amount": 1}).to_list(length=None)
+    return sum(row["amount"] for row in rows)
+
 @app.get("/api/admin/financial/revenue")
-async def get_revenue_stats():
-    """Get revenue statistics"""
+async def get_revenue_stats(start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
+    """Get revenue statistics, optionally for payments created in [start_date, end_date)"""
     try:
-        # Get completed transactions
-        completed_transactions = await db.payment_transactions.find({"status": "completed"}).to_list(length=None)
+        revenue = await aggregate_revenue(created_at_range(start_date, end_date))
         
-        total_revenue = 0
-        subscription_revenue = 0
-        verification_revenue = 0
-        package_revenue = 0
-        
-        for transaction in completed_transactions:
-            amount = transaction.get("amount", 0) / 100  # Convert paise to rupees
-            total_revenue += amount
-            
-            payment_type = transaction.get("payment_type", "")
-            if payment_type == "subscription":
-                subscription_revenue += amount
-            elif payment_type == "verification":
-                verification_revenue += amount
-            elif payment_type == "highlight_package":
-                package_revenue += amount
+        def rupees(payment_type):
+            return revenue.get(payment_type, {}).get("amount", 0) / 100  # Convert paise to rupees
         
         return {
-            "total_revenue": total_revenue,
-            "subscription_revenue": subscription_revenue,
-            "verification_revenue": verification_revenue,
-            "package_revenue": package_revenue,
-            "total_transactions": len(completed_transactions)
+            "total_revenue": sum(row["amount"] for row in revenue.values()) / 100,
+            "subscription_revenue": rupees("subscription"),
+            "verification_revenue": rupees("verification"),
+            "package_revenue": rupees("highlight_package"),
+            "total_transactions": sum(row["count"] for row in revenue.values())
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching revenue stats: {str(e)}")
 
+@app.get("/api/admin/financial/revenue/timeseries")
+async def get_revenue_timeseries(
+    granularity: Optional[str] = "month",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    payment_type: Optional[str] = None,
+    package_id: Optional[str] = None
+):
+    """Revenue per day or month from the rollups.
+
+    start/end are inclusive periods (YYYY-MM-DD for days, YYYY-MM for months);
+    periods without payments are returned as zero.
+    """
+    try:
+        if granularity not in REVENUE_GRANULARITIES:
+            raise HTTPException(status_code=400, detail=f"Invalid granularity. Must be one of: {', '.join(REVENUE_GRANULARITIES)}")
+        length = REVENUE_GRANULARITIES[granularity]
+        period_format = "%Y-%m-%d" if granularity == "day" else "%Y-%m"
+        for bound in (start, end):
+            if bound is None:
+                continue
+            try:
+                valid = len(bound) == length and datetime.strptime(bound, period_format)
+            except ValueError:
+                valid = False
+            if not valid:
+                raise HTTPException(status_code=400, detail=f"Invalid period '{bound}' for {granularity} granularity")
+        
+        query = {"granularity": granularity}
+        if start or end:
+            query["period"] = {**({"$gte": start} if start else {}), **({"$lte": end} if end else {})}
+        if payment_type:
+            query["payment_type"] = payment_type
+        if package_id:
+            query["package_id"] = package_id
+        
+        points = {}
+        async for bucket in db.revenue_rollups.find(query, {"_id": 0}):
+            point = points.setdefault(bucket["period"], {"period": bucket["period"], "revenue": 0, "transactions": 0, "by_type": {}})
+            point["revenue"] += bucket["amount"]
+            point["transactions"] += bucket["count"]
+            by_type = point["by_type"].setdefault(bucket["payment_type"] or "unknown", {"revenue": 0, "transactions": 0})
+            by_type["revenue"] += bucket["amount"]
+            by_type["transactions"] += bucket["count"]
+        
+        # Fill gaps between the first and last period so charts get a continuous axis
+        first = start or min(points, default=None)
+        last = end or max(points, default=None)
+        series = []
+        if first and last:
+            if granularity == "day":
+                current, stop = datetime.fromisoformat(first), datetime.fromisoformat(last)
+            else:
+                current, stop = datetime.fromisoformat(first + "-01"), datetime.fromisoformat(last + "-01")
+            while current <= stop and len(series) < REVENUE_TIMESERIES_MAX_POINTS:
+                period = current.isoformat()[:length]
+                point = points.get(period, {"period": period, "revenue": 0, "transactions": 0, "by_type": {}})
+                point["revenue"] /= 100  # Convert paise to rupees
+                for by_type in point["by_type"].values():
+                    by_type["revenue"] /= 100
+                series.append(point)
+                if granularity == "day":
+                    current += timedelta(days=1)
+                else:
+                    current = current.replace(year=current.year + current.month // 12, month=current.month % 12 + 1)
+        
+        return {"granularity": granularity, "series": series}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching revenue timeseries: {str(e)}")
+
+@app.post("/api/admin/financial/revenue/rollups/rebuild")
+async def rebuild_revenue_rollup_buckets():
+    """Backfill revenue rollups from the full payment history"""
+    try:
+        return await rebuild_revenue_rollups()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rebuilding revenue rollups: {str(e)}")
+
 # 2.3 Content & Community Management
 @app.get("/api/admin/content/reports")
 async def get_content_reports():
@@ -978,32 +3289,106 @@ async def get_content_reports():
         raise HTTPException(status_code=500, detail=f"Error fetching content reports: {str(e)}")
 
 # 2.4 Analytics & Reports
+# Daily creator count snapshots (copied from platform_counters), keyed by UTC date
+SNAPSHOT_METRICS = ["total", "verified", "premium"] + TIER_PACKAGES + CREATOR_STATUSES
+GROWTH_PERIOD_DAYS = 30
+
+async def take_creator_snapshot() -> Dict:
+    """Record today's counts unless another run already did"""
+    now = datetime.now(timezone.utc)
+    counters = await read_creator_counters()
+    snapshot = {metric: counters.get(metric, 0) for metric in SNAPSHOT_METRICS}
+    await db.creator_snapshots.update_one(
+        {"_id": now.date().isoformat()},
+        {"$setOnInsert": {**snapshot, "taken_at": now.isoformat()}},
+        upsert=True
+    )
+    return snapshot
+
+async def creator_snapshot_loop():
+    """Snapshot at startup (if today is missing) and just after every UTC midnight"""
+    while True:
+        try:
+            await take_creator_snapshot()
+        except Exception as e:
+            print(f"Error taking creator snapshot: {str(e)}")
+        now = datetime.now(timezone.utc)
+        next_run = (now + timedelta(days=1)).replace(hour=0, minute=0, second=5, microsecond=0)
+        await asyncio.sleep((next_run - now).total_seconds())
+
+async def creator_growth(metric: str, days: int) -> Dict:
+    """Change of a snapshot metric over the last `days` days, with day-over-day deltas"""
+    since = (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+    snapshots = await db.creator_snapshots.find({"_id": {"$gte": since}}).sort("_id", 1).to_list(length=None)
+    
+    series = []
+    previous = None
+    for snapshot in snapshots:
+        value = snapshot.get(metric, 0)
+        series.append({"date": snapshot["_id"], "value": value, "delta": None if previous is None else value - previous})
+        previous = value
+    
+    # The oldest snapshot in the window is the baseline; a single snapshot has nothing to compare with
+    current = series[-1] if series else None
+    baseline = series[0] if len(series) > 1 else None
+    growth_rate = None
+    if baseline and baseline["value"]:
+        growth_rate = round((current["value"] - baseline["value"]) / baseline["value"] * 100, 1)
+    return {
+        "metric": metric,
+        "period_days": days,
+        "current": current["value"] if current else None,
+        "baseline": baseline["value"] if baseline else None,
+        "baseline_date": baseline["date"] if baseline else None,
+        "delta": current["value"] - baseline["value"] if baseline else None,
+        "growth_rate": growth_rate,
+        "series": series
+    }
+
+@app.get("/api/admin/analytics/growth")
+async def get_growth_analytics(metric: Optional[str] = "total", days: Optional[int] = GROWTH_PERIOD_DAYS):
+    """Growth of creator counts from daily snapshots"""
+    try:
+        if metric not in SNAPSHOT_METRICS:
+            raise HTTPException(status_code=400, detail=f"Invalid metric. Must be one of: {', '.join(SNAPSHOT_METRICS)}")
+        if not 1 <= days <= 3660:
+            raise HTTPException(status_code=400, detail="days must be between 1 and 3660")
+        return await creator_growth(metric, days)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching growth analytics: {str(e)}")
+
 @app.get("/api/admin/analytics/dashboard")
+@cached_response("analytics_dashboard", ttl=60, maxsize=1, stale_ttl=600)
 async def get_analytics_dashboard():
     """Get comprehensive analytics dashboard"""
     try:
         # User Growth
-        total_creators = await db.creators.count_documents({})
-        active_creators = await db.creators.count_documents({"profile_status": "approved"})
+        counts = await read_creator_counters()
+        total_creators = counts["total"]
+        active_creators = counts["approved"]
+        growth = await creator_growth("total", GROWTH_PERIOD_DAYS)
         
         # Revenue Analytics
-        completed_transactions = await db.payment_transactions.find({"status": "completed"}).to_list(length=None)
-        total_revenue = sum(t.get("amount", 0) for t in completed_transactions) / 100
+        revenue = await aggregate_revenue()
+        total_revenue = sum(row["amount"] for row in revenue.values()) / 100
+        transaction_count = sum(row["count"] for row in revenue.values())
         
         # Engagement Metrics
-        verified_creators = await db.creators.count_documents({"verification_status": True})
-        premium_creators = await db.creators.count_documents({"highlight_package": {"$ne": None}})
+        verified_creators = counts["verified"]
+        premium_creators = counts["premium"]
         
         return {
             "user_growth": {
                 "total_creators": total_creators,
                 "active_creators": active_creators,
-                "growth_rate": "12%"  # Mock data
+                "growth_rate": f"{growth['growth_rate']}%" if growth["growth_rate"] is not None else None
             },
             "revenue_metrics": {
                 "total_revenue": total_revenue,
-                "monthly_revenue": total_revenue * 0.3,  # Mock calculation
-                "transaction_count": len(completed_transactions)
+                "monthly_revenue": await current_month_revenue() / 100,
+                "transaction_count": transaction_count
             },
             "engagement_metrics": {
                 "verified_creators": verified_creators,
@@ -1122,6 +3507,92 @@ async def verify_otp(email: str, otp: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error verifying OTP: {str(e)}")
 
+# 2.7 Database Maintenance
+@app.get("/api/admin/database/indexes")
+async def get_database_indexes():
+    """List declared indexes with the query shapes they serve and current drift"""
+    try:
+        collections = {}
+        for collection_name, specs in DATABASE_INDEXES.items():
+            drift = await inspect_indexes(collection_name)
+            collections[collection_name] = {
+                "declared": [
+                    {
+                        "name": spec["name"],
+                        "keys": [list(key) for key in spec["keys"]],
+                        "options": index_options(spec),
+                        "queries": spec.get("queries", [])
+                    }
+                    for spec in specs
+                ],
+                **drift
+            }
+
+        return {
+            "collections": collections,
+            "in_sync": all(not c["missing"] and not c["mismatched"] for c in collections.values()),
+            "last_reconciliation": index_report
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching indexes: {str(e)}")
+
+@app.post("/api/admin/database/indexes/reconcile")
+async def reconcile_database_indexes():
+    """Create any missing declared indexes now"""
+    try:
+        return await reconcile_indexes()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reconciling indexes: {str(e)}")
+
+@app.post("/api/admin/database/backfill-derived")
+async def backfill_derived_database_fields():
+    """Recompute normalized/derived fields on documents written by older versions"""
+    try:
+        return {"version": DERIVED_FIELDS_VERSION, "updated": await backfill_all_derived_fields()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error backfilling derived fields: {str(e)}")
+
+@app.post("/api/admin/stats/counters/repair")
+async def repair_platform_counters(dry_run: Optional[bool] = False):
+    """Recount creators and overwrite platform_counters; the response lists the drift found"""
+    try:
+        return await repair_creator_counters(apply=not dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error repairing counters: {str(e)}")
+
+@app.get("/api/admin/cache/stats")
+async def get_cache_stats():
+    """Size and hit ratio of every in-process cache"""
+    return {
+        "responses": {name: cache.stats() for name, cache in response_caches.items()},
+        "search_facets": facet_cache.stats(),
+        "matches": match_cache.stats()
+    }
+
+@app.get("/api/admin/matching/cache")
+async def get_match_cache_stats():
+    """Hit/miss counters and size of the match result cache"""
+    return match_cache.stats()
+
+@app.get("/api/admin/matching/scoring", response_model=MatchScoringConfig)
+async def get_match_scoring():
+    """Weights currently used by every match engine"""
+    return match_scoring
+
+@app.put("/api/admin/matching/scoring", response_model=MatchScoringConfig)
+async def update_match_scoring(config: MatchScoringConfig):
+    """Change match scoring weights; other server processes pick them up on their next reload"""
+    try:
+        await db.app_settings.update_one(
+            {"key": MATCH_SCORING_SETTINGS_KEY},
+            {"$set": {"value": config.dict(), "updated_at": datetime.now(timezone.utc).isoformat()}},
+            upsert=True
+        )
+        apply_match_scoring(config)
+        return match_scoring
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating match scoring: {str(e)}")
+
 # Business Owners Section (Brand Collaboration)
 @app.post("/api/business-owners", response_model=BusinessOwner)
 async def create_business_owner(business_data: BusinessOwnerCreate):
@@ -1136,9 +3607,11 @@ async def create_business_owner(business_data: BusinessOwnerCreate):
         business_owner = BusinessOwner(**business_data.dict())
         business_dict = business_owner.dict()
         business_dict = prepare_for_mongo(business_dict)
+        business_dict.update(derive_business_fields(business_dict))
         
         # Insert into database
         await db.business_owners.insert_one(business_dict)
+        await on_business_written(None, business_dict)
         
         return business_owner
     except HTTPException:
@@ -1148,27 +3621,36 @@ async def create_business_owner(business_data: BusinessOwnerCreate):
 
 @app.get("/api/business-owners", response_model=List[BusinessOwner])
 async def get_business_owners(
+    response: Response,
     industry: Optional[str] = None,
     location: Optional[str] = None,
     verified_only: Optional[bool] = False,
     limit: Optional[int] = 20,
-    skip: Optional[int] = 0
+    skip: Optional[int] = 0,
+    cursor: Optional[str] = None
 ):
-    """Get list of business owners with optional filtering"""
+    """Get list of business owners with optional filtering, newest first (cursor via X-Next-Cursor)"""
     try:
         filter_query = {}
-        if industry:
-            filter_query["industry"] = {"$regex": industry, "$options": "i"}
-        if location:
-            filter_query["location"] = {"$regex": location, "$options": "i"}
+        if prefix_match(industry):
+            filter_query["industry_norm"] = prefix_match(industry)
+        if prefix_match(location):
+            filter_query["location_norm"] = prefix_match(location)
         if verified_only:
             filter_query["verified_business"] = True
         
         # Only show approved business owners
         filter_query["profile_status"] = "approved"
         
-        cursor = db.business_owners.find(filter_query).skip(skip).limit(limit)
-        business_owners = await cursor.to_list(length=limit)
+        if cursor:
+            db_cursor = db.business_owners.find(apply_cursor(filter_query, cursor, NEWEST_FIRST))
+        else:
+            db_cursor = db.business_owners.find(filter_query).skip(skip)
+        business_owners = await db_cursor.sort(NEWEST_FIRST).limit(limit).to_list(length=limit)
+        
+        page_cursor = next_cursor(business_owners, limit, NEWEST_FIRST)
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
         
         parsed_business_owners = []
         for business in business_owners:
@@ -1177,6 +3659,8 @@ async def get_business_owners(
                 parsed_business_owners.append(BusinessOwner(**parsed_business))
         
         return parsed_business_owners
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching business owners: {str(e)}")
 
@@ -1195,6 +3679,67 @@ async def get_business_owner(business_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching business owner: {str(e)}")
 
+@app.put("/api/business-owners/{business_id}", response_model=BusinessOwner)
+async def update_business_owner(business_id: str, update_data: BusinessOwnerUpdate):
+    """Update business owner profile and collaboration requirements"""
+    try:
+        existing_business = await db.business_owners.find_one({"id": business_id})
+        if not existing_business:
+            raise HTTPException(status_code=404, detail="Business owner not found")
+        
+        update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+        if update_dict:
+            update_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+            update_dict.update(derive_business_fields({**existing_business, **update_dict}))
+            
+            await db.business_owners.update_one(
+                {"id": business_id},
+                {"$set": update_dict}
+            )
+        
+        updated_business = {**existing_business, **update_dict}
+        await on_business_written(existing_business, updated_business)
+        return BusinessOwner(**parse_from_mongo(updated_business))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating business owner: {str(e)}")
+
+@app.get("/api/business-owners/match-creator/{creator_id}")
+async def match_business_owners_for_creator(creator_id: str, limit: Optional[int] = 10):
+    """Find business owners whose requirements a creator meets, best match first"""
+    try:
+        creator = await db.creators.find_one({"id": creator_id}, {"_id": 0, "id": 1, **{f: 1 for f in MATCH_SCORING_FIELDS}})
+        if not creator:
+            raise HTTPException(status_code=404, detail="Creator not found")
+        if not business_match_index.ready:
+            # Wait for the one shared load rather than starting another per request
+            await asyncio.shield(business_match_index_built())
+            if not business_match_index.ready:
+                raise HTTPException(status_code=503, detail="Business match index is not available yet")
+        
+        matches = business_match_index.matches(creator, limit)
+        if not matches:
+            return []
+        
+        cursor = db.business_owners.find({
+            "id": {"$in": [business_id for business_id, _, _ in matches]},
+            "profile_status": "approved"
+        })
+        found = {business["id"]: business async for business in cursor}
+        
+        matched_businesses = []
+        for business_id, match_score, total_followers in matches:
+            business = found.get(business_id)
+            if business:
+                business = parse_from_mongo(business)
+                matched_businesses.append(BusinessOwnerMatch(**business, total_followers=total_followers, match_score=match_score))
+        return matched_businesses
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error matching business owners: {str(e)}")
+
 # Collaboration Requests
 @app.post("/api/collaboration-requests", response_model=CollaborationRequest)
 async def create_collaboration_request(request_data: CollaborationRequestCreate, business_owner_id: str):
@@ -1275,72 +3820,258 @@ async def respond_to_collaboration_request(request_id: str, status: str, respons
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error responding to collaboration request: {str(e)}")
 
-@app.get("/api/creators/match-business/{business_owner_id}")
-async def match_creators_for_business(business_owner_id: str, limit: Optional[int] = 10):
-    """Find creators that match business owner requirements"""
-    try:
-        # Get business owner requirements
-        business_owner = await db.business_owners.find_one({"id": business_owner_id})
-        if not business_owner:
-            raise HTTPException(status_code=404, detail="Business owner not found")
-        
-        # Build creator filter based on business requirements
-        filter_query = {"profile_status": "approved"}
-        
-        # Industry/category match
-        if business_owner.get("industry"):
-            filter_query["category"] = {"$regex": business_owner["industry"], "$options": "i"}
-        
-        # Location match
-        if business_owner.get("location"):
-            filter_query["location"] = {"$regex": business_owner["location"], "$options": "i"}
+# Creator fields read by the matching filter and calculate_business_match_score
+MATCH_SCORING_FIELDS = [
+    "category", "location", "verification_status", "highlight_package",
+    "instagram_followers", "youtube_subscribers", "twitter_followers",
+    "tiktok_followers", "snapchat_followers"
+]
+
+# table: precomputed rows in creator_matches (falls back to vector while stale)
+# pool: vector scoring in MATCH_POOL_WORKERS processes (falls back to vector when disabled)
+# semantic: nearest creators by bio/category text, with similarity added to the score
+# vector: NumPy scoring over creator_columns
+# database: filter, score and rank inside a MongoDB aggregation
+# scan: score limit * 2 fetched creators in Python
+MATCH_ENGINES = ["table", "pool", "semantic", "vector", "database", "scan"]
+MATCH_ENGINE = os.environ.get("MATCH_ENGINE", "table")
+
+def match_creator_filter(business_owner: Dict) -> Dict:
+    """MongoDB filter for creators eligible to match a business owner"""
+    filter_query = {"profile_status": "approved"}
+    
+    # Industry/category match
+    if prefix_match(business_owner.get("industry")):
+        filter_query["category_norm"] = prefix_match(business_owner["industry"])
+    
+    # Location match
+    if prefix_match(business_owner.get("location")):
+        filter_query["location_norm"] = prefix_match(business_owner["location"])
+    
+    return filter_query
+
+async def scan_match_creators(business_owner: Dict, limit: int, projection=None) -> List[Dict]:
+    """Score a page of candidate creators one by one (reference implementation)"""
+    # Get creators and filter by follower count
+    cursor = db.creators.find(match_creator_filter(business_owner), projection).limit(limit * 2)  # Get more to filter
+    creators = await cursor.to_list(length=limit * 2)
+    
+    # Filter by follower requirements
+    min_followers = business_owner.get("min_followers", 0)
+    max_followers = business_owner.get("max_followers", 1000000)
+    preferred_platforms = business_owner.get("preferred_platforms", [])
+    
+    matched_creators = []
+    for creator in creators:
+        creator_parsed = parse_from_mongo(creator)
+        if not creator_parsed:
+            continue
         
-        # Get creators and filter by follower count
-        cursor = db.creators.find(filter_query).limit(limit * 2)  # Get more to filter
-        creators = await cursor.to_list(length=limit * 2)
+        # Calculate total followers across preferred platforms
+        total_followers = 0
+        platform_match = False
         
-        # Filter by follower requirements
-        min_followers = business_owner.get("min_followers", 0)
-        max_followers = business_owner.get("max_followers", 1000000)
-        preferred_platforms = business_owner.get("preferred_platforms", [])
+        if not preferred_platforms or "instagram" in preferred_platforms:
+            total_followers += creator_parsed.get("instagram_followers", 0)
+            platform_match = True
+        if not preferred_platforms or "youtube" in preferred_platforms:
+            total_followers += creator_parsed.get("youtube_subscribers", 0)
+            platform_match = True
+        if not preferred_platforms or "twitter" in preferred_platforms:
+            total_followers += creator_parsed.get("twitter_followers", 0)
+            platform_match = True
+        if not preferred_platforms or "tiktok" in preferred_platforms:
+            total_followers += creator_parsed.get("tiktok_followers", 0)
+            platform_match = True
+        if not preferred_platforms or "snapchat" in preferred_platforms:
+            total_followers += creator_parsed.get("snapchat_followers", 0)
+            platform_match = True
         
-        matched_creators = []
-        for creator in creators:
-            creator_parsed = parse_from_mongo(creator)
-            if not creator_parsed:
-                continue
-            
-            # Calculate total followers across preferred platforms
-            total_followers = 0
-            platform_match = False
-            
-            if not preferred_platforms or "instagram" in preferred_platforms:
-                total_followers += creator_parsed.get("instagram_followers", 0)
-                platform_match = True
-            if not preferred_platforms or "youtube" in preferred_platforms:
-                total_followers += creator_parsed.get("youtube_subscribers", 0)
-                platform_match = True
-            if not preferred_platforms or "twitter" in preferred_platforms:
-                total_followers += creator_parsed.get("twitter_followers", 0)
-                platform_match = True
-            if not preferred_platforms or "tiktok" in preferred_platforms:
-                total_followers += creator_parsed.get("tiktok_followers", 0)
-                platform_match = True
-            if not preferred_platforms or "snapchat" in preferred_platforms:
-                total_followers += creator_parsed.get("snapchat_followers", 0)
-                platform_match = True
+        # Check if creator meets requirements
+        if (platform_match and 
+            min_followers <= total_followers <= max_followers):
             
-            # Check if creator meets requirements
-            if (platform_match and 
-                min_followers <= total_followers <= max_followers):
-                
-                creator_parsed["total_followers"] = total_followers
-                creator_parsed["match_score"] = calculate_business_match_score(creator_parsed, business_owner)
-                matched_creators.append(Creator(**creator_parsed))
+            creator_parsed["total_followers"] = total_followers
+            creator_parsed["match_score"] = calculate_business_match_score(creator_parsed, business_owner)
+            matched_creators.append(creator_parsed)
+    
+    # Sort by match score and return top matches
+    matched_creators.sort(key=lambda x: x["match_score"], reverse=True)
+    return matched_creators[:limit]
+
+def match_score_expression(business_owner: Dict, total_followers) -> Dict:
+    """calculate_business_match_score as a MongoDB aggregation expression, built from the current weights"""
+    weights = match_scoring
+    industry = (business_owner.get("industry") or "").lower()
+    location = (business_owner.get("location") or "").lower()
+    min_followers = business_owner.get("min_followers") or 0
+    max_followers = business_owner.get("max_followers")
+    max_followers = 1000000 if max_followers is None else max_followers
+    
+    def contains(field, value):
+        return {"$gte": [{"$indexOfCP": [{"$toLower": {"$ifNull": [field, ""]}}, value]}, 0]}
+    
+    terms = [
+        {"$cond": [contains("$category", industry), weights.category, 0]},
+        {"$cond": [contains("$location", location), weights.location, 0]},
+        {"$cond": [{"$eq": ["$verification_status", True]}, weights.verified, 0]}
+    ]
+    if weights.packages:
+        terms.append({"$switch": {
+            "branches": [
+                {"case": {"$eq": ["$highlight_package", package]}, "then": bonus}
+                for package, bonus in weights.packages.items()
+            ],
+            "default": 0
+        }})
+    span = max_followers - min_followers
+    if span:
+        distance = {"$divide": [{"$abs": {"$subtract": [total_followers, (min_followers + max_followers) / 2]}}, span]}
+        terms.append({"$trunc": {"$multiply": [weights.follower_range, {"$subtract": [1, distance]}]}})
+    else:
+        terms.append(weights.follower_range)
+    return {"$add": terms}
+
+async def database_match_creators(business_owner: Dict, limit: int, projection=None) -> List[Dict]:
+    """Let MongoDB filter, score and rank candidates; only `limit` documents come back"""
+    set_key = platform_set_key(business_owner.get("preferred_platforms"))
+    if not set_key:
+        return []
+    min_followers = business_owner.get("min_followers") or 0
+    max_followers = business_owner.get("max_followers")
+    max_followers = 1000000 if max_followers is None else max_followers
+    total_field = f"platform_sums.{set_key}"
+    
+    pipeline = [
+        {"$match": {
+            **match_creator_filter(business_owner),
+            total_field: {"$gte": min_followers, "$lte": max_followers}
+        }},
+        {"$addFields": {
+            "total_followers": f"${total_field}",
+            "match_score": match_score_expression(business_owner, f"${total_field}")
+        }},
+        {"$sort": {"match_score": -1, "_id": 1}},
+        {"$limit": limit}
+    ]
+    if projection:
+        pipeline.append({"$project": {**projection, "total_followers": 1, "match_score": 1}})
+    
+    matched_creators = []
+    async for creator in db.creators.aggregate(pipeline):
+        creator = parse_from_mongo(creator)
+        creator["match_score"] = int(creator["match_score"])
+        matched_creators.append(creator)
+    return matched_creators
+
+async def fetch_matched_creators(matches, projection=None) -> List[Dict]:
+    """Load creator documents for (creator_id, match_score, total_followers) rows, keeping their order"""
+    if not matches:
+        return []
+    
+    cursor = db.creators.find({"id": {"$in": [creator_id for creator_id, _, _ in matches]}}, projection)
+    found = {creator["id"]: creator async for creator in cursor}
+    
+    matched_creators = []
+    for creator_id, match_score, total_followers in matches:
+        creator = found.get(creator_id)
+        if creator:
+            creator = parse_from_mongo(creator)
+            creator["total_followers"] = total_followers
+            creator["match_score"] = match_score
+            matched_creators.append(creator)
+    return matched_creators
+
+async def vector_match_creators(business_owner: Dict, limit: int, projection=None) -> List[Dict]:
+    """Score every approved creator in memory, then fetch only the top matches"""
+    return await fetch_matched_creators(creator_columns.top_matches(business_owner, limit), projection)
+
+async def semantic_match_creators(business_owner: Dict, limit: int, projection=None) -> List[Dict]:
+    """Re-score the creators whose text is nearest to the business description"""
+    creator_ids, similarities = semantic_index.search(business_vector(business_owner), max(SEMANTIC_CANDIDATES, limit * 10))
+    matches = creator_columns.blended_matches(business_owner, creator_ids, similarities, limit)
+    return await fetch_matched_creators(matches, projection)
+
+async def pool_match_creators(business_owner: Dict, limit: int, projection=None) -> List[Dict]:
+    """Vector scoring in a worker process, keeping the event loop free"""
+    return await fetch_matched_creators(await match_pool.top_matches(business_owner, limit), projection)
+
+async def table_match_creators(business_owner: Dict, limit: int, projection=None):
+    """Serve matches from creator_matches; returns (creators, computed_at) or None when unusable"""
+    if limit > MATCH_TABLE_SIZE or business_owner["id"] in match_table_dirty:
+        return None
+    row = await db.creator_matches.find_one({"business_owner_id": business_owner["id"]})
+    if not row:
+        return None
+    matches = [(m["creator_id"], m["match_score"], m["total_followers"]) for m in row["matches"][:limit]]
+    return await fetch_matched_creators(matches, projection), row["computed_at"]
+
+async def compute_business_matches(business_owner_id: str, limit: int, projection, engine: str):
+    """Run a match engine; returns (creators, computed_at), computed_at only for table results"""
+    # Get business owner requirements
+    business_owner = await db.business_owners.find_one({"id": business_owner_id})
+    if not business_owner:
+        raise HTTPException(status_code=404, detail="Business owner not found")
+    
+    if engine == "table":
+        served = await table_match_creators(business_owner, limit, projection)
+        if served:
+            return served
+        engine = "vector"
+    
+    if engine == "pool" and not match_pool.ready:
+        engine = "vector"
+    if engine == "semantic" and not (semantic_index.ready and creator_columns.ready):
+        engine = "vector"
+    
+    # Columns are loaded in the background at startup
+    if engine == "vector" and not creator_columns.ready:
+        engine = "scan"
+    
+    if engine == "pool":
+        matched_creators = await pool_match_creators(business_owner, limit, projection)
+    elif engine == "semantic":
+        matched_creators = await semantic_match_creators(business_owner, limit, projection)
+    elif engine == "vector":
+        matched_creators = await vector_match_creators(business_owner, limit, projection)
+    elif engine == "database":
+        matched_creators = await database_match_creators(business_owner, limit, projection)
+    else:
+        matched_creators = await scan_match_creators(business_owner, limit, projection)
+    return matched_creators, None
+
+@app.get("/api/creators/match-business/{business_owner_id}")
+async def match_creators_for_business(
+    business_owner_id: str,
+    response: Response,
+    limit: Optional[int] = 10,
+    fields: Optional[str] = None,
+    engine: Optional[str] = None
+):
+    """Find creators that match business owner requirements, best match first.
+
+    Results are cached until the creator directory or the business owner changes.
+    Table results carry the time they were computed in X-Matches-Computed-At.
+    """
+    try:
+        engine = engine or MATCH_ENGINE
+        if engine not in MATCH_ENGINES:
+            raise HTTPException(status_code=400, detail=f"Invalid engine. Must be one of: {', '.join(MATCH_ENGINES)}")
+        projection, requested = creator_projection(fields, MATCH_SCORING_FIELDS)
+        
+        cache_key = match_cache.key(business_owner_id, limit, fields, engine)
+        cached = match_cache.get(cache_key)
+        if cached:
+            matched_creators, computed_at = cached
+        else:
+            matched_creators, computed_at = await compute_business_matches(business_owner_id, limit, projection, engine)
+            match_cache.put(cache_key, (matched_creators, computed_at))
+        if computed_at:
+            response.headers["X-Matches-Computed-At"] = computed_at
         
-        # Sort by match score and return top matches
-        matched_creators.sort(key=lambda x: x.dict().get("match_score", 0), reverse=True)
-        return matched_creators[:limit]
+        if requested:
+            return [sparse_document(c, requested, ["total_followers", "match_score"]) for c in matched_creators]
+        return [CreatorMatch(**c) for c in matched_creators]
         
     except HTTPException:
         raise
@@ -1349,30 +4080,27 @@ async def match_creators_for_business(business_owner_id: str, limit: Optional[in
 
 def calculate_business_match_score(creator, business_owner):
     """Calculate match score between creator and business owner"""
+    weights = match_scoring
     score = 0
     
     # Category match
     if (business_owner.get("industry", "").lower() in 
         creator.get("category", "").lower()):
-        score += 30
+        score += weights.category
     
     # Location match
     if (business_owner.get("location", "").lower() in 
         creator.get("location", "").lower()):
-        score += 20
+        score += weights.location
     
     # Verification bonus
     if creator.get("verification_status"):
-        score += 15
+        score += weights.verified
     
     # Highlight package bonus
     package = creator.get("highlight_package")
-    if package == "platinum":
-        score += 20
-    elif package == "gold":
-        score += 15
-    elif package == "silver":
-        score += 10
+    if package:
+        score += weights.packages.get(package, 0)
     
     # Follower range match
     total_followers = creator.get("total_followers", 0)
@@ -1380,10 +4108,14 @@ def calculate_business_match_score(creator, business_owner):
     max_req = business_owner.get("max_followers", 1000000)
     
     if min_req <= total_followers <= max_req:
-        # Bonus for being in sweet spot (not too low, not too high)
-        mid_point = (min_req + max_req) / 2
-        distance_from_mid = abs(total_followers - mid_point) / (max_req - min_req)
-        score += int(15 * (1 - distance_from_mid))  # 0-15 points based on how close to middle
+        if max_req == min_req:
+            # A single allowed value: the creator sits exactly on it
+            score += weights.follower_range
+        else:
+            # Bonus for being in sweet spot (not too low, not too high)
+            mid_point = (min_req + max_req) / 2
+            distance_from_mid = abs(total_followers - mid_point) / (max_req - min_req)
+            score += int(weights.follower_range * (1 - distance_from_mid))  # 0-follower_range points based on how close to middle
     
     return score
 
@@ -439,6 +439,23 @@ class GrowKroAPITester:
                 self.log_result("Get Non-existent Creator", False, f"Expected 404, got: {response.status_code}")
         except Exception as e:
             self.log_result("Get Non-existent Creator", False, f"Exception: {str(e)}")
+        
+        # Test batch lookup preserves order and reports missing ids
+        try:
+            fake_id = str(uuid.uuid4())
+            ids = list(reversed(self.test_creators)) + [fake_id]
+            response = requests.post(f"{self.base_url}/creators/batch-get", json={"ids": ids, "fields": "id,name"})
+            if response.status_code == 200:
+                data = response.json()
+                returned_ids = [creator["id"] for creator in data["creators"]]
+                if returned_ids == ids[:-1] and data["missing"] == [fake_id]:
+                    self.log_result("Batch Get Creators", True, f"Retrieved {len(returned_ids)} creators in order")
+                else:
+                    self.log_result("Batch Get Creators", False, f"Got {returned_ids}, missing {data['missing']}")
+            else:
+                self.log_result("Batch Get Creators", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_result("Batch Get Creators", False, f"Exception: {str(e)}")
     
     def test_update_creator(self):
         """Test updating creator profile"""
@@ -518,6 +535,38 @@ class GrowKroAPITester:
                 self.log_result("Search by Text Query", False, f"Status: {response.status_code}")
         except Exception as e:
             self.log_result("Search by Text Query", False, f"Exception: {str(e)}")
+        
+        # Test 4: Multi-word query ranked by relevance
+        try:
+            response = requests.get(f"{self.base_url}/search/creators?q=fashion lifestyle")
+            if response.status_code == 200:
+                data = response.json()
+                scores = [c.get("relevance") for c in data.get("results", []) if c.get("relevance") is not None]
+                if "took_ms" not in data:
+                    self.log_result("Search Relevance Ranking", False, "Missing took_ms in response")
+                elif scores == sorted(scores, reverse=True):
+                    self.log_result("Search Relevance Ranking", True, f"{data.get('count', 0)} results via {data.get('engine')} in {data['took_ms']}ms")
+                else:
+                    self.log_result("Search Relevance Ranking", False, f"Results not ordered by relevance: {scores}")
+            else:
+                self.log_result("Search Relevance Ranking", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_result("Search Relevance Ranking", False, f"Exception: {str(e)}")
+        
+        # Test 5: Facet counts in the same response
+        try:
+            response = requests.get(f"{self.base_url}/search/creators?facets=true&limit=5")
+            if response.status_code == 200:
+                facets = response.json().get("facets", {})
+                if all(name in facets for name in ["category", "location", "highlight_package", "verification_status", "total"]):
+                    category_total = sum(bucket["count"] for bucket in facets["category"])
+                    self.log_result("Search Facets", True, f"Total: {facets['total']}, categorized: {category_total}")
+                else:
+                    self.log_result("Search Facets", False, f"Missing facets. Got: {list(facets.keys())}")
+            else:
+                self.log_result("Search Facets", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_result("Search Facets", False, f"Exception: {str(e)}")
     
     def test_filter_creators(self):
         """Test creator filtering"""
@@ -1482,6 +1531,30 @@ class GrowKroAPITester:
         except Exception as e:
             self.log_result("Verify OTP Non-existent Email", False, f"Exception: {str(e)}")
 
+    def test_admin_database_indexes(self):
+        """Test declared MongoDB indexes are reported and in sync"""
+        print("\n=== Testing Admin Database Indexes ===")
+        
+        try:
+            response = requests.get(f"{self.base_url}/admin/database/indexes")
+            if response.status_code == 200:
+                report = response.json()
+                collections = report.get("collections", {})
+                if all(name in collections for name in ["creators", "business_owners", "payment_transactions"]):
+                    self.log_result("Index Report Structure", True, f"Collections: {list(collections.keys())}")
+                else:
+                    self.log_result("Index Report Structure", False, f"Missing collections. Got: {list(collections.keys())}")
+                
+                if report.get("in_sync"):
+                    self.log_result("Indexes In Sync", True, "All declared indexes exist")
+                else:
+                    missing = {name: c["missing"] + c["mismatched"] for name, c in collections.items() if c["missing"] or c["mismatched"]}
+                    self.log_result("Indexes In Sync", False, f"Drift: {missing}")
+            else:
+                self.log_result("Database Indexes", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_result("Database Indexes", False, f"Exception: {str(e)}")
+
     def run_enhanced_admin_tests(self):
         """Run all enhanced admin panel tests"""
         print("\n🔥 Starting Enhanced GrowKro Admin Panel Tests")
@@ -1498,6 +1571,7 @@ class GrowKroAPITester:
         self.test_admin_analytics_dashboard()
         self.test_admin_notifications_system()
         self.test_admin_verification_compliance()
+        self.test_admin_database_indexes()
         
         # Cleanup test creators
         self.test_delete_creator()
@@ -1531,6 +1605,7 @@ class GrowKroAPITester:
         self.test_admin_analytics_dashboard()
         self.test_admin_notifications_system()
         self.test_admin_verification_compliance()
+        self.test_admin_database_indexes()
         
         # Cleanup
         self.test_delete_creator()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+GrowKro Performance Benchmark
+Seeds a local MongoDB with synthetic creators and business owners, then measures
+latency percentiles and throughput of the matching, search and listing endpoints.
+
+Usage:
+    python performance_benchmark.py --size small                # 10k creators, seed + start server + run
+    python performance_benchmark.py --creators 250000 --businesses 10000
+    python performance_benchmark.py --skip-seed --url http://localhost:8001/api
+
+Results are written as JSON (see --output) so runs can be compared across releases.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+
+import requests
+from pymongo import MongoClient
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+# Dataset presets: (creators, business owners)
+DATASET_SIZES = {
+    "small": (10000, 10000),
+    "medium": (100000, 10000),
+    "large": (1000000, 10000)
+}
+
+CATEGORIES = ["Fashion", "Tech", "Food", "Travel", "Fitness", "Beauty", "Lifestyle", "Gaming", "Education", "Finance"]
+LOCATIONS = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Jaipur", "Ahmedabad", "Gurgaon"]
+BIO_WORDS = ["daily", "reviews", "tips", "vlogs", "tutorials", "style", "recipes", "travel", "workout", "gadgets",
+             "budget", "luxury", "street", "home", "family", "students", "college", "wellness", "outfits", "unboxing"]
+PLATFORMS = ["instagram", "youtube", "twitter", "tiktok", "snapchat"]
+SEARCH_TERMS = ["fashion", "tech", "food", "travel", "fit", "beauty", "reviews", "style", "creator", "vlogs"]
+
+def follower_count(rng):
+    """Heavy-tailed follower counts, like a real creator directory"""
+    return int(min(rng.paretovariate(1.2) * 800, 5000000))
+
+def synthetic_creator(rng, index, now):
+    category = rng.choice(CATEGORIES)
+    created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+    roll = rng.random()
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"Creator {index}",
+        "email": f"creator{index}@benchmark.growkro.test",
+        "bio": f"{category} " + " ".join(rng.sample(BIO_WORDS, 6)),
+        "instagram_followers": follower_count(rng),
+        "youtube_subscribers": follower_count(rng) if rng.random() < 0.5 else 0,
+        "twitter_followers": follower_count(rng) if rng.random() < 0.3 else 0,
+        "tiktok_followers": follower_count(rng) if rng.random() < 0.2 else 0,
+        "snapchat_followers": follower_count(rng) if rng.random() < 0.1 else 0,
+        "highlight_package": rng.choice(["silver", "gold", "platinum"]) if roll < 0.05 else None,
+        "verification_status": rng.random() < 0.2,
+        "location": rng.choice(LOCATIONS),
+        "category": category,
+        "profile_status": "approved" if rng.random() < 0.8 else rng.choice(["pending", "rejected", "suspended"]),
+        "created_at": created_at,
+        "updated_at": created_at
+    }
+
+def synthetic_business(rng, index, now):
+    industry = rng.choice(CATEGORIES)
+    min_followers = rng.choice([0, 1000, 10000, 50000])
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"Owner {index}",
+        "email": f"business{index}@benchmark.growkro.test",
+        "company_name": f"{industry} Co {index}",
+        "company_description": f"{industry} brand " + " ".join(rng.sample(BIO_WORDS, 4)),
+        "industry": industry,
+        "location": rng.choice(LOCATIONS + [""]),
+        "budget_range": rng.choice(["low", "medium", "high"]),
+        "collaboration_type": rng.choice(["sponsored_posts", "product_reviews", "brand_ambassador", "events"]),
+        "target_audience": " ".join(rng.sample(BIO_WORDS, 3)),
+        "preferred_platforms": rng.sample(PLATFORMS, rng.randint(0, 2)),
+        "min_followers": min_followers,
+        "max_followers": rng.choice([100000, 500000, 1000000, 5000000]),
+        "profile_status": rng.choice(["pending", "approved"]),
+        "created_at": now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+    }
+
+def seed_database(mongo_url, db_name, creators, businesses, seed, batch_size=5000):
+    """Drop and refill the benchmark database through the server's own models"""
+    import server
+
+    rng = random.Random(seed)
+    database = MongoClient(mongo_url)[db_name]
+    # Derived collections too, or stats would be served from the previous dataset
+    for collection in ["creators", "business_owners", "creator_matches", "platform_counters",
+                       "creator_snapshots", "revenue_rollups"]:
+        database[collection].drop()
+    now = datetime.now(timezone.utc)
+
+    print(f"\n=== Seeding {creators} creators and {businesses} business owners into {db_name} ===")
+    started = time.time()
+    batch = []
+    for index in range(creators):
+        creator = server.prepare_for_mongo(server.Creator(**synthetic_creator(rng, index, now)).dict())
+        creator.update(server.derive_creator_fields(creator))
+        batch.append(creator)
+        if len(batch) == batch_size:
+            database.creators.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        database.creators.insert_many(batch, ordered=False)
+
+    batch = [
+        {**business, **server.derive_business_fields(business)}
+        for business in (
+            server.prepare_for_mongo(server.BusinessOwner(**synthetic_business(rng, index, now)).dict())
+            for index in range(businesses)
+        )
+    ]
+    for start in range(0, len(batch), batch_size):
+        database.business_owners.insert_many(batch[start:start + batch_size], ordered=False)
+    print(f"✅ Seeded in {time.time() - started:.1f}s")
+
+def start_server(mongo_url, db_name, port, engine):
+    """Run the API against the benchmark database"""
+    env = {**os.environ, "MONGO_URL": mongo_url, "DB_NAME": db_name}
+    if engine:
+        env["MATCH_ENGINE"] = engine
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+
+def wait_until_ready(base_url, business_id, timeout):
+    """Wait until the declared MongoDB indexes are rebuilt (seeding drops them) and a precomputed match table is served"""
+    deadline = time.time() + timeout
+    indexes_in_sync = False
+    while time.time() < deadline:
+        try:
+            if not indexes_in_sync:
+                response = requests.get(f"{base_url}/admin/database/indexes", timeout=30)
+                indexes_in_sync = response.status_code == 200 and response.json().get("in_sync") is True
+            if indexes_in_sync:
+                response = requests.get(f"{base_url}/creators/match-business/{business_id}", params={"engine": "table"}, timeout=5)
+                if response.status_code == 200 and "X-Matches-Computed-At" in response.headers:
+                    return True
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+    if not indexes_in_sync:
+        print("❌ Declared indexes are still missing or mismatched; search would use its fallback")
+    return False
+
+def reported_engine(response):
+    """The engine a response says served it (search endpoints), or None"""
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    return body.get("engine") if isinstance(body, dict) else None
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class PerformanceBenchmark:
+    def __init__(self, base_url, requests_per_scenario, concurrency, seed):
+        self.base_url = base_url
+        self.requests_per_scenario = requests_per_scenario
+        self.concurrency = concurrency
+        self.rng = random.Random(seed)
+        self.results = []
+
+    def measure(self, name, make_request):
+        """Run one scenario and record latency percentiles (ms) and throughput"""
+        calls = [make_request() for _ in range(self.requests_per_scenario)]
+        warmup = requests.Session()
+        for path, params in calls[:min(10, len(calls))]:
+            warmup.get(f"{self.base_url}{path}", params=params)
+
+        # requests.Session is not documented as thread-safe: one per worker thread
+        local = threading.local()
+
+        def timed(call):
+            path, params = call
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+            started = time.perf_counter()
+            response = local.session.get(f"{self.base_url}{path}", params=params)
+            latency = (time.perf_counter() - started) * 1000
+            return latency, response.status_code, reported_engine(response)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            outcomes = list(executor.map(timed, calls))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _, _ in outcomes)
+        errors = sum(1 for _, status, _ in outcomes if status != 200)
+        engines = {}
+        for _, _, engine in outcomes:
+            if engine:
+                engines[engine] = engines.get(engine, 0) + 1
+        result = {
+            "scenario": name,
+            "requests": len(outcomes),
+            "concurrency": self.concurrency,
+            "errors": errors,
+            "throughput_rps": round(len(outcomes) / elapsed, 2),
+            "latency_ms": {
+                "mean": round(statistics.mean(latencies), 2),
+                "p50": round(percentile(latencies, 0.50), 2),
+                "p95": round(percentile(latencies, 0.95), 2),
+                "p99": round(percentile(latencies, 0.99), 2),
+                "max": round(latencies[-1], 2)
+            }
+        }
+        if engines:
+            result["engines"] = engines  # responses per engine the server reported using
+        self.results.append(result)
+        status = "✅" if errors == 0 else "❌"
+        print(f"{status} {name}: p50 {result['latency_ms']['p50']}ms, p95 {result['latency_ms']['p95']}ms, "
+              f"p99 {result['latency_ms']['p99']}ms, {result['throughput_rps']} req/s, {errors} errors"
+              + (f", engines {engines}" if engines else ""))
+        if "regex" in engines:
+            print(f"⚠️  {name} was partly served by the regex fallback, not the text index")
+        return result
+
+    def run(self, business_ids, engines):
+        print("\n=== Running Scenarios ===")
+        for engine in engines:
+            self.measure(f"match_creators_for_business[{engine}]", lambda engine=engine: (
+                f"/creators/match-business/{self.rng.choice(business_ids)}", {"limit": 10, "engine": engine}
+            ))
+        self.measure("search_creators[q]", lambda: (
+            "/search/creators", {"q": self.rng.choice(SEARCH_TERMS), "limit": 20}
+        ))
+        self.measure("search_creators[filters]", lambda: (
+            "/search/creators", {
+                "category": self.rng.choice(CATEGORIES), "location": self.rng.choice(LOCATIONS),
+                "min_followers": self.rng.choice([0, 1000, 10000]), "limit": 20
+            }
+        ))
+        self.measure("search_creators[facets]", lambda: (
+            "/search/creators", {"q": self.rng.choice(SEARCH_TERMS), "facets": "true", "limit": 20}
+        ))
+        self.measure("get_creators[newest]", lambda: ("/creators", {"limit": 20}))
+        self.measure("get_creators[category]", lambda: (
+            "/creators", {"category": self.rng.choice(CATEGORIES), "limit": 20, "sort": "followers"}
+        ))
+        self.measure("get_creators_by_package", lambda: (
+            f"/creators/by-package/{self.rng.choice(['silver', 'gold', 'platinum'])}", {"limit": 20}
+        ))
+        self.measure("get_platform_stats", lambda: ("/stats", {}))
+        self.measure("get_user_management_stats", lambda: ("/admin/users/stats", {}))
+        return self.results
+
+def compare_stats_queries(database, repeats):
+    """Time the old per-count queries against the single aggregation the stats endpoints now run"""
+    import server
+
+    def count_if(condition):
+        return {"$sum": {"$cond": [condition, 1, 0]}}
+
+    shapes = {
+        "platform_stats": (
+            [{}, {"verification_status": True}, {"highlight_package": "silver"},
+             {"highlight_package": "gold"}, {"highlight_package": "platinum"}],
+            {"total": {"$sum": 1}, "verified": count_if({"$eq": ["$verification_status", True]}),
+             **{package: count_if({"$eq": ["$highlight_package", package]}) for package in server.TIER_PACKAGES}}
+        ),
+        "user_management_stats": (
+            [{}] + [{"profile_status": status} for status in server.CREATOR_STATUSES],
+            {"total": {"$sum": 1},
+             **{status: count_if({"$eq": ["$profile_status", status]}) for status in server.CREATOR_STATUSES}}
+        )
+    }
+
+    print("\n=== Stats Query Comparison ===")
+    comparisons = []
+    for name, (filters, accumulators) in shapes.items():
+        sequential = []
+        aggregated = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            for query in filters:
+                database.creators.count_documents(query)
+            sequential.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            list(database.creators.aggregate([{"$group": {"_id": None, **accumulators}}]))
+            aggregated.append((time.perf_counter() - started) * 1000)
+        comparison = {
+            "query": name,
+            "sequential_count_documents_ms": round(statistics.median(sequential), 2),
+            "single_aggregation_ms": round(statistics.median(aggregated), 2)
+        }
+        comparison["speedup"] = round(comparison["sequential_count_documents_ms"] / max(comparison["single_aggregation_ms"], 0.01), 2)
+        comparisons.append(comparison)
+        print(f"📊 {name}: {comparison['sequential_count_documents_ms']}ms sequential vs "
+              f"{comparison['single_aggregation_ms']}ms aggregated ({comparison['speedup']}x)")
+    return comparisons
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), text=True).strip()
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="GrowKro API performance benchmark")
+    parser.add_argument("--size", choices=DATASET_SIZES, default="small")
+    parser.add_argument("--creators", type=int, help="override the creator count of --size")
+    parser.add_argument("--businesses", type=int, help="override the business owner count of --size")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default="growkro_benchmark")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the data already in --db-name")
+    parser.add_argument("--url", help="benchmark an already running API instead of starting one")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--engines", default="table,vector,database", help="match engines to compare")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--ready-timeout", type=int, default=600, help="seconds to wait for background indexes")
+    parser.add_argument("--stats-repeats", type=int, default=5, help="runs per stats query comparison, 0 to skip")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="results file (default: benchmark_results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    creators, businesses = DATASET_SIZES[args.size]
+    creators = args.creators or creators
+    businesses = args.businesses or businesses
+
+    if not args.skip_seed:
+        seed_database(args.mongo_url, args.db_name, creators, businesses, args.seed)
+
+    database = MongoClient(args.mongo_url)[args.db_name]
+    business_ids = [b["id"] for b in database.business_owners.find({}, {"_id": 0, "id": 1})]
+    if not business_ids:
+        print("❌ No business owners in the benchmark database; run without --skip-seed")
+        sys.exit(1)
+
+    server_process = None
+    base_url = args.url
+    if not base_url:
+        server_process = start_server(args.mongo_url, args.db_name, args.port, None)
+        base_url = f"http://127.0.0.1:{args.port}/api"
+    try:
+        print(f"\n=== Waiting for {base_url} to finish startup jobs ===")
+        if not wait_until_ready(base_url, business_ids[0], args.ready_timeout):
+            print("❌ Server did not become ready in time")
+            sys.exit(1)
+
+        benchmark = PerformanceBenchmark(base_url, args.requests, args.concurrency, args.seed)
+        results = benchmark.run(business_ids, [engine for engine in args.engines.split(",") if engine])
+    finally:
+        if server_process:
+            server_process.terminate()
+            server_process.wait()
+
+    query_comparisons = compare_stats_queries(database, args.stats_repeats) if args.stats_repeats else []
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "dataset": {
+            "creators": database.creators.estimated_document_count(),
+            "business_owners": len(business_ids),
+            "seed": args.seed
+        },
+        "settings": {"requests_per_scenario": args.requests, "concurrency": args.concurrency},
+        "results": results,
+        "query_comparisons": query_comparisons
+    }
+    output = args.output or os.path.join("benchmark_results", f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📊 Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Randomized parity checks for the match engines.
+
+The scan engine scores with calculate_business_match_score; the vector and pool
+engines must return the same creators, in the same order, with identical scores.
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import server  # noqa: E402
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+CATEGORIES = ["Fashion", "fashion & style", "Tech", "Tech Reviews", "Food", "Travel", "Fitness", ""]
+LOCATIONS = ["Mumbai", "mumbai", "Navi Mumbai", "Delhi", "New Delhi", "Bangalore", ""]
+INDUSTRIES = ["Fashion", "fashion", "Tech", "Food", "Travel", ""]
+PLATFORMS = list(server.PLATFORM_FOLLOWER_FIELDS)
+PACKAGES = [None, None, None, "silver", "gold", "platinum"]
+CREATORS = 400
+CASES = 150
+
+WEIGHTS = {
+    "default": server.MatchScoringConfig(),
+    "custom": server.MatchScoringConfig(
+        category=7, location=41, verified=3, follower_range=55,
+        packages={"silver": 2, "gold": 9, "platinum": 13}
+    )
+}
+
+# Follower counts some creators hold exactly, so zero-span requirements have matches
+EXACT_FOLLOWERS = [1000, 5000]
+
+def followers(rng):
+    roll = rng.random()
+    if roll < 0.3:
+        return 0
+    if roll < 0.4:
+        return rng.choice(EXACT_FOLLOWERS)
+    return int(min(rng.paretovariate(1.1) * 500, 3000000))
+
+def random_creator(rng, index):
+    creator = {
+        "id": f"creator-{index}",
+        "name": f"Creator {index}",
+        "email": f"creator{index}@parity.test",
+        "category": rng.choice(CATEGORIES),
+        "location": rng.choice(LOCATIONS),
+        "verification_status": rng.random() < 0.3,
+        "highlight_package": rng.choice(PACKAGES),
+        "profile_status": "approved" if rng.random() < 0.85 else rng.choice(["pending", "rejected", "suspended"]),
+        **{field: followers(rng) for field in server.PLATFORM_FOLLOWER_FIELDS.values()}
+    }
+    creator.update(server.derive_creator_fields(creator))
+    return creator
+
+def random_business(rng, index):
+    min_followers = rng.choice([0, 0, 100, 1000, 5000, 20000])
+    if rng.random() < 0.15:
+        # Zero span: only creators with exactly this many followers qualify
+        min_followers = max_followers = rng.choice(EXACT_FOLLOWERS)
+    else:
+        max_followers = min_followers + rng.choice([500, 10000, 100000, 1000000, 3000000])
+    return {
+        "id": f"business-{index}",
+        "industry": rng.choice(INDUSTRIES),
+        "location": rng.choice(LOCATIONS),
+        "preferred_platforms": rng.sample(PLATFORMS, rng.randint(0, 3)),
+        "min_followers": min_followers,
+        "max_followers": max_followers
+    }
+
+@pytest.fixture
+def directory(monkeypatch):
+    """Random creators in a mock database and in the global creator columns"""
+    rng = random.Random(20240611)
+    creators = [random_creator(rng, index) for index in range(CREATORS)]
+    database = mongomock_motor.AsyncMongoMockClient()["growkro_parity"]
+    asyncio.run(database.creators.insert_many([dict(creator) for creator in creators]))
+    monkeypatch.setattr(server, "db", database)
+    monkeypatch.setattr(server, "creator_columns", server.CreatorColumns())
+    server.creator_columns.load([creator for creator in creators if creator["profile_status"] == "approved"])
+    return rng
+
+async def scan_matches(business, limit):
+    """Every eligible creator ranked by calculate_business_match_score"""
+    # limit * 2 covers the whole collection, so the scan sees every candidate
+    matched = await server.scan_match_creators(business, CREATORS, {"_id": 0})
+    return [(creator["id"], creator["match_score"], creator["total_followers"]) for creator in matched[:limit]]
+
+@pytest.mark.parametrize("weights", list(WEIGHTS))
+def test_scan_scores_match_reference(directory, monkeypatch, weights):
+    monkeypatch.setattr(server, "match_scoring", WEIGHTS[weights])
+    rng = directory
+
+    async def run_cases():
+        for index in range(CASES // 3):
+            business = random_business(rng, index)
+            for creator_id, match_score, total_followers in await scan_matches(business, CREATORS):
+                creator = await server.db.creators.find_one({"id": creator_id}, {"_id": 0})
+                expected = server.calculate_business_match_score({**creator, "total_followers": total_followers}, business)
+                assert match_score == expected, (business, creator)
+
+    asyncio.run(run_cases())
+
+@pytest.mark.parametrize("weights", list(WEIGHTS))
+def test_vector_engine_matches_scan(directory, monkeypatch, weights):
+    monkeypatch.setattr(server, "match_scoring", WEIGHTS[weights])
+    rng = directory
+    for index in range(CASES):
+        business = random_business(rng, index)
+        limit = rng.choice([1, 5, 10, 50, CREATORS])
+        expected = asyncio.run(scan_matches(business, limit))
+        assert server.creator_columns.top_matches(business, limit) == expected, business
+
+def test_pool_engine_matches_scan(directory, monkeypatch):
+    monkeypatch.setattr(server, "match_scoring", WEIGHTS["custom"])
+    rng = directory
+    pool = server.MatchPool(1)
+    pool.start()
+
+    async def run_cases():
+        for index in range(CASES // 3):
+            business = random_business(rng, index)
+            limit = rng.choice([1, 10, 50])
+            assert await pool.top_matches(business, limit) == await scan_matches(business, limit), business
+
+    try:
+        asyncio.run(run_cases())
+    finally:
+        pool.shutdown()